@@ -3,11 +3,17 @@ Main __init__.py file for the YouTube Shorts AI Pipeline package.
 This file makes the directory a Python package and exposes key modules.
 """
 
-from src.text_generation import TextGenerator
-from src.audio_generation import AudioGenerator
-from src.video_generation import VideoGenerator
-from src.music_generation import MusicGenerator
-from src.pipeline_integration import YouTubeShortsCreator
+import importlib
+
+# Subpackage of each exported class, imported on first access so that
+# importing one component does not load the dependencies of all the others
+_EXPORTS = {
+    'TextGenerator': 'src.text_generation',
+    'AudioGenerator': 'src.audio_generation',
+    'VideoGenerator': 'src.video_generation',
+    'MusicGenerator': 'src.music_generation',
+    'YouTubeShortsCreator': 'src.pipeline_integration'
+}
 
 __version__ = "1.0.0"
 __author__ = "YouTube Shorts AI Pipeline Team"
@@ -19,3 +25,11 @@ __all__ = [
     'MusicGenerator',
     'YouTubeShortsCreator'
 ]
+
+def __getattr__(name):
+    """Import an exported class from its subpackage on first access."""
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
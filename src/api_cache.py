@@ -0,0 +1,287 @@
+"""
+Content-addressable cache for API responses in the YouTube Shorts AI Pipeline.
+This module stores paid API results on disk so that re-running a step with the same inputs
+returns immediately instead of calling the provider again.
+"""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import inspect
+import tempfile
+import functools
+import contextvars
+from contextlib import contextmanager
+from .file_utils import ensure_dir
+
+_cache_enabled = contextvars.ContextVar("api_cache_enabled", default=True)
+
+def _dumps(value):
+    """Serialize a value for keys and sidecars alike, so anything that can be keyed can be stored."""
+    return json.dumps(value, sort_keys=True, default=str)
+
+@contextmanager
+def caching(enabled=True):
+    """
+    Enable or disable API caching for the calls made inside the block.
+
+    The setting follows the current context, so it carries over into asyncio
+    tasks and asyncio.to_thread calls started inside the block.
+
+    Args:
+        enabled (bool, optional): Whether cached results may be used and stored. Defaults to True.
+    """
+    token = _cache_enabled.set(enabled)
+    try:
+        yield
+    finally:
+        _cache_enabled.reset(token)
+
+class APICache:
+    """On-disk cache of API results keyed by a SHA256 of the provider, method and arguments."""
+
+    def __init__(self, cache_dir):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir (str): Directory to keep cached results in
+        """
+        self.cache_dir = cache_dir
+
+    def key(self, provider, method, args):
+        """
+        Compute the cache key for a call.
+
+        Args:
+            provider (str): Name of the API client
+            method (str): Name of the client method
+            args (dict): The call arguments, excluding the output path
+
+        Returns:
+            str: The hex SHA256 digest identifying the call
+        """
+        canonical = _dumps([provider, method, args])
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def _path(self, key, suffix):
+        """Return the path of a cache entry, sharded by the first two key characters."""
+        return os.path.join(self.cache_dir, key[:2], f"{key}{suffix}")
+
+    def get_json(self, key):
+        """
+        Look up a cached JSON result.
+
+        Args:
+            key (str): The cache key
+
+        Returns:
+            tuple: (hit, value), where value is None on a miss
+        """
+        try:
+            with open(self._path(key, ".json"), "r") as f:
+                return True, json.load(f)["value"]
+        except (OSError, ValueError, KeyError):
+            return False, None
+
+    def put_json(self, key, value, info):
+        """
+        Store a JSON result.
+
+        Args:
+            key (str): The cache key
+            value: The JSON-serializable result
+            info (dict): Provider, method and arguments of the call
+        """
+        self._write(self._path(key, ".json"), _dumps({**info, "value": value}).encode())
+
+    def get_file(self, key, output_path):
+        """
+        Copy a cached file result to output_path.
+
+        Args:
+            key (str): The cache key
+            output_path (str): Where the file is expected
+
+        Returns:
+            bool: Whether the file was found in the cache
+        """
+        sidecar = self._path(key, ".json")
+        try:
+            with open(sidecar, "r") as f:
+                cached_path = self._path(key, json.load(f)["suffix"])
+            ensure_dir(os.path.dirname(os.path.abspath(output_path)))
+            shutil.copyfile(cached_path, output_path)
+            return True
+        except (OSError, ValueError, KeyError):
+            return False
+
+    def put_file(self, key, path, info):
+        """
+        Store a file result along with a sidecar metadata JSON.
+
+        Args:
+            key (str): The cache key
+            path (str): The file produced by the call
+            info (dict): Provider, method and arguments of the call
+        """
+        suffix = os.path.splitext(path)[1]
+        if not self._copy(path, self._path(key, suffix)):
+            return
+        # The sidecar is written last, so an entry only counts once its file is complete
+        self._write(self._path(key, ".json"), _dumps({**info, "suffix": suffix}).encode())
+
+    def _write(self, path, data):
+        """Atomically write data to path, ignoring filesystem errors."""
+        try:
+            directory = ensure_dir(os.path.dirname(path))
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+    def _copy(self, src, path):
+        """Atomically copy the file at src to path without reading it into memory; returns whether it succeeded."""
+        tmp_path = None
+        try:
+            directory = ensure_dir(os.path.dirname(path))
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            os.close(fd)
+            shutil.copyfile(src, tmp_path)
+            os.replace(tmp_path, path)
+            return True
+        except OSError:
+            # Do not leave a partial copy of a large video behind
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+
+def _call_info(fn, client, args, kwargs):
+    """
+    Describe a call for the cache.
+
+    Args:
+        fn (callable): The undecorated client method
+        client: The client instance
+        args (tuple): Positional arguments of the call
+        kwargs (dict): Keyword arguments of the call
+
+    Returns:
+        tuple: (info dict, output path or None)
+    """
+    bound = inspect.signature(fn).bind(client, *args, **kwargs)
+    bound.apply_defaults()
+    call_args = dict(bound.arguments)
+    call_args.pop("self", None)
+    output_path = call_args.pop("output_path", None)
+    info = {
+        "provider": getattr(client, "cache_namespace", type(client).__name__),
+        "method": fn.__name__,
+        "args": call_args,
+        "created": time.time()
+    }
+    return info, output_path
+
+def lookup(cache, fn, client, *args, **kwargs):
+    """
+    Restore the cached result of a file-producing call without making it.
+
+    Args:
+        cache (APICache): The cache to look in
+        fn (callable): The client method; a memoize_api-decorated method is unwrapped
+        client: The client instance
+        *args: Positional arguments of the call
+        **kwargs: Keyword arguments of the call, including output_path
+
+    Returns:
+        bool: Whether the result was restored to output_path
+    """
+    if cache is None or not _cache_enabled.get():
+        return False
+    fn = inspect.unwrap(fn)
+    info, output_path = _call_info(fn, client, args, kwargs)
+    return cache.get_file(cache.key(info["provider"], info["method"], info["args"]), output_path)
+
+def store(cache, fn, client, *args, **kwargs):
+    """
+    Store the file produced by a call that was made outside memoize_api.
+
+    Args:
+        cache (APICache): The cache to store in
+        fn (callable): The client method; a memoize_api-decorated method is unwrapped
+        client: The client instance
+        *args: Positional arguments of the call
+        **kwargs: Keyword arguments of the call, including output_path
+    """
+    if cache is None or not _cache_enabled.get():
+        return
+    fn = inspect.unwrap(fn)
+    info, output_path = _call_info(fn, client, args, kwargs)
+    cache.put_file(cache.key(info["provider"], info["method"], info["args"]), output_path, info)
+
+def memoize_api(fn):
+    """
+    Cache the results of an API client method in the client's api_cache.
+
+    Methods with an output_path argument are treated as producing a file:
+    the path is left out of the key, the file is copied into the cache, and
+    a hit copies it back to the requested path. Other methods must return
+    JSON-serializable values. Caching is skipped while the client's
+    api_cache is None or inside a caching(False) block. Clients key entries on
+    their class name unless they set a cache_namespace attribute.
+
+    Args:
+        fn (callable): The client method to wrap, sync or async
+
+    Returns:
+        callable: The wrapped method
+    """
+    def prepare(client, args, kwargs):
+        cache = getattr(client, "api_cache", None)
+        if cache is None or not _cache_enabled.get():
+            return None, None, None, None
+        info, output_path = _call_info(fn, client, args, kwargs)
+        key = cache.key(info["provider"], info["method"], info["args"])
+        return cache, key, info, output_path
+
+    def cached(cache, key, output_path):
+        if output_path is not None:
+            return cache.get_file(key, output_path), output_path
+        return cache.get_json(key)
+
+    def save(cache, key, info, output_path, result):
+        if output_path is not None:
+            cache.put_file(key, result, info)
+        else:
+            cache.put_json(key, result, info)
+
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(self, *args, **kwargs):
+            cache, key, info, output_path = prepare(self, args, kwargs)
+            if cache is None:
+                return await fn(self, *args, **kwargs)
+            hit, value = cached(cache, key, output_path)
+            if hit:
+                return value
+            result = await fn(self, *args, **kwargs)
+            save(cache, key, info, output_path, result)
+            return result
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        cache, key, info, output_path = prepare(self, args, kwargs)
+        if cache is None:
+            return fn(self, *args, **kwargs)
+        hit, value = cached(cache, key, output_path)
+        if hit:
+            return value
+        result = fn(self, *args, **kwargs)
+        save(cache, key, info, output_path, result)
+        return result
+    return wrapper
@@ -0,0 +1,94 @@
+"""
+Async ElevenLabs API Client for audio generation in the YouTube Shorts AI Pipeline.
+This module issues several voiceover requests concurrently over a shared connection pool.
+"""
+
+import os
+import aiohttp
+from ..env_utils import load_env
+from ..file_utils import ensure_dir
+from ..api_cache import memoize_api
+
+class AsyncElevenLabsClient:
+    """Async client for generating several ElevenLabs voiceovers in parallel."""
+
+    def __init__(self, api_key=None, max_connections=4, api_cache=None):
+        """
+        Initialize the async ElevenLabs client.
+
+        Args:
+            api_key (str, optional): ElevenLabs API key. If not provided, will look for ELEVENLABS_API_KEY in environment variables.
+            max_connections (int, optional): Maximum number of open connections. Defaults to 4.
+            api_cache (APICache, optional): Cache for results of identical calls. Defaults to None.
+        """
+        load_env()
+        self.api_key = api_key or os.getenv("ELEVENLABS_API_KEY")
+        if not self.api_key:
+            raise ValueError("ElevenLabs API key is required. Set it as ELEVENLABS_API_KEY environment variable or pass it to the constructor.")
+
+        self.base_url = "https://api.elevenlabs.io/v1"
+        self.headers = {
+            "xi-api-key": self.api_key,
+            "Content-Type": "application/json"
+        }
+        self.max_connections = max_connections
+        self.api_cache = api_cache
+        self.session = None
+
+    async def __aenter__(self):
+        self.session = aiohttp.ClientSession(
+            headers=self.headers,
+            connector=aiohttp.TCPConnector(limit=self.max_connections)
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.session.close()
+        self.session = None
+
+    @memoize_api
+    async def generate_and_save_speech(self, text, output_path, voice_id, model_id="eleven_turbo_v2",
+                                       stability=0.5, similarity_boost=0.75):
+        """
+        Generate speech from text and stream it to a file.
+
+        Args:
+            text (str): The text to convert to speech
+            output_path (str): The path to save the audio file to
+            voice_id (str): The ID of the voice to use
+            model_id (str, optional): The ID of the model to use. Defaults to "eleven_turbo_v2".
+            stability (float, optional): Voice stability (0-1). Defaults to 0.5.
+            similarity_boost (float, optional): Voice similarity boost (0-1). Defaults to 0.75.
+
+        Returns:
+            str: The path to the saved audio file
+        """
+        if self.session is None:
+            raise RuntimeError("AsyncElevenLabsClient must be used as an async context manager")
+
+        url = f"{self.base_url}/text-to-speech/{voice_id}/stream"
+        output_format = output_path.split(".")[-1]
+
+        payload = {
+            "text": text,
+            "model_id": model_id,
+            "voice_settings": {
+                "stability": stability,
+                "similarity_boost": similarity_boost
+            }
+        }
+
+        params = {"optimize_streaming_latency": 3}
+        if output_format == "mp3":
+            params["output_format"] = "mp3_44100_128"
+
+        ensure_dir(os.path.dirname(os.path.abspath(output_path)))
+
+        async with self.session.post(url, json=payload, params=params,
+                                     headers={"Accept": f"audio/{output_format}"}) as response:
+            response.raise_for_status()
+            with open(output_path, "wb") as f:
+                async for chunk in response.content.iter_chunked(4096):
+                    f.write(chunk)
+
+        return output_path
@@ -4,8 +4,65 @@ This module provides a simplified interface for generating voiceovers for YouTub
 """
 
 import os
+import re
+import shutil
+import asyncio
+import contextvars
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from .elevenlabs_client import ElevenLabsClient
 
+# Voice attributes that ElevenLabs reports under "labels"
+LABEL_KEYS = ("gender", "accent", "age")
+
+# Patterns and SSML templates used by optimize_script_for_tts
+_SENTENCE_END_RE = re.compile(r"([.!?]) ")
+_QUESTION_LINE_RE = re.compile(r"^(.*\?.*)$", re.M)
+_BREAK = r"\1 <break time='0.3s'/> "
+_EMPHASIS = r"<emphasis level='moderate'>\1</emphasis>"
+_SPEAK_TEMPLATE = "<speak>\n{}\n</speak>"
+
+@lru_cache(maxsize=256)
+def _optimize_script(script):
+    """
+    Build the SSML for a script; cached because batch runs often repeat scripts.
+    
+    Args:
+        script (str): The script to optimize
+        
+    Returns:
+        str: The optimized script
+    """
+    # Add pauses after sentences
+    script = _SENTENCE_END_RE.sub(_BREAK, script)
+    
+    # Emphasize questions
+    script = _QUESTION_LINE_RE.sub(_EMPHASIS, script)
+    
+    # Wrap in SSML tags
+    return _SPEAK_TEMPLATE.format(script)
+
+def _concat_mp3(paths, output_path):
+    """
+    Join MP3 files without re-encoding.
+    
+    Args:
+        paths (list): Paths of the MP3 files to join, in order
+        output_path (str): The path to save the joined file to
+    """
+    try:
+        subprocess.run(
+            ["ffmpeg", "-y", "-v", "error", "-i", "concat:" + "|".join(paths), "-c", "copy", output_path],
+            check=True
+        )
+    except FileNotFoundError:
+        # ffmpeg is not installed; MP3 frames can still be joined byte for byte
+        with open(output_path, "wb") as out:
+            for path in paths:
+                with open(path, "rb") as f:
+                    shutil.copyfileobj(f, out)
+
 class AudioGenerator:
     """Audio generation component for YouTube Shorts pipeline."""
     
@@ -24,15 +81,42 @@ class AudioGenerator:
         Get a list of available voices.
         
         Args:
-            refresh (bool, optional): Whether to refresh the cache. Defaults to False.
+            refresh (bool, optional): Whether to refresh the in-memory and on-disk caches. Defaults to False.
             
         Returns:
             list: Available voices
         """
         if self.available_voices is None or refresh:
-            self.available_voices = self.client.get_voices()
+            self.available_voices = self.client.get_voices(refresh=refresh)
+            self._build_voice_index(self.available_voices)
         return self.available_voices
     
+    def _build_voice_index(self, voices):
+        """
+        Build lookup indices used by find_voice and _resolve_voice.
+        
+        The name and label indices map a lowercased value to the positions of the
+        voices that have it, so find_voice can return the first match in list order.
+        The ID index maps each voice_id to its voice.
+        
+        Args:
+            voices (list): Available voices
+        """
+        self._by_id = {}
+        self._by_name = {}
+        self._by_label = {key: {} for key in LABEL_KEYS}
+        self._unlabeled = []
+        
+        for i, voice in enumerate(voices):
+            self._by_id.setdefault(voice.get("voice_id"), voice)
+            self._by_name.setdefault(voice.get("name", "").lower(), []).append(i)
+            if "labels" in voice:
+                labels = voice["labels"]
+                for key in LABEL_KEYS:
+                    self._by_label[key].setdefault(labels.get(key, "").lower(), []).append(i)
+            else:
+                self._unlabeled.append(i)
+    
     def find_voice(self, criteria):
         """
         Find a voice based on criteria.
@@ -44,36 +128,87 @@ class AudioGenerator:
             dict: Voice information or None if not found
         """
         voices = self.list_voices()
+        if not voices:
+            return None
+        
+        # Check the most selective criteria first so the candidate set shrinks quickly
+        order = {"name": 0, "gender": 1, "accent": 1, "age": 1}
+        candidates = None
+        
+        for key, value in sorted(criteria.items(), key=lambda item: order.get(item[0], 2)):
+            value = value.lower()
+            
+            if key == "name":
+                matched = set(self._by_name.get(value, ()))
+            elif key in LABEL_KEYS:
+                # Labels match on substring (e.g. "american" matches "american (southern)")
+                matched = set()
+                for label, positions in self._by_label[key].items():
+                    if value in label:
+                        matched.update(positions)
+                # Voices without labels fall back to a top-level field
+                matched.update(i for i in self._unlabeled if voices[i].get(key, "").lower() == value)
+            else:
+                pool = candidates if candidates is not None else range(len(voices))
+                matched = {i for i in pool if voices[i].get(key, "").lower() == value}
+            
+            candidates = matched if candidates is None else candidates & matched
+            if not candidates:
+                return None
+        
+        if candidates is None:
+            return voices[0]
+        return voices[min(candidates)]
+    
+    def _resolve_voice(self, voice_criteria=None, voice_id=None):
+        """
+        Resolve the voice to use for a voiceover.
+        
+        Args:
+            voice_criteria (dict, optional): Criteria to match for voice selection. Defaults to None.
+            voice_id (str, optional): Specific voice ID to use. Defaults to None.
+            
+        Returns:
+            tuple: The voice ID and voice name
+        """
+        # If voice_criteria is provided but not voice_id, find a matching voice
+        if not voice_id and voice_criteria:
+            voice = self.find_voice(voice_criteria)
+            if voice:
+                return voice.get("voice_id"), voice.get("name")
+        elif voice_id:
+            # If voice_id is provided, the name is only needed for metadata, so look it
+            # up in voices that are already loaded (or cached on disk) instead of calling the API
+            if self.available_voices is None:
+                cached_voices = self.client.get_cached_voices()
+                if cached_voices is not None:
+                    self.available_voices = cached_voices
+                    self._build_voice_index(cached_voices)
+            
+            voice = self._by_id.get(voice_id) if self.available_voices is not None else None
+            return voice_id, voice.get("name") if voice else "Unknown"
         
-        for voice in voices:
-            match = True
-            for key, value in criteria.items():
-                if key == "gender" and "labels" in voice:
-                    # Handle gender in labels
-                    if value.lower() not in voice.get("labels", {}).get("gender", "").lower():
-                        match = False
-                        break
-                elif key == "accent" and "labels" in voice:
-                    # Handle accent in labels
-                    if value.lower() not in voice.get("labels", {}).get("accent", "").lower():
-                        match = False
-                        break
-                elif key == "age" and "labels" in voice:
-                    # Handle age in labels
-                    if value.lower() not in voice.get("labels", {}).get("age", "").lower():
-                        match = False
-                        break
-                elif voice.get(key, "").lower() != value.lower():
-                    match = False
-                    break
-            
-            if match:
-                return voice
-        
-        return None
+        # If no matching voice is found or no criteria were given, use a default voice
+        voices = self.list_voices()
+        if voices:
+            return voices[0].get("voice_id"), voices[0].get("name")
+        raise ValueError("No voices available")
+    
+    def _voiceover_metadata(self, script, voice_id, voice_name, model_id, stability, similarity_boost):
+        """Build the metadata dictionary returned alongside a voiceover."""
+        return {
+            "voice_id": voice_id,
+            "voice_name": voice_name,
+            "model_id": model_id,
+            "stability": stability,
+            "similarity_boost": similarity_boost,
+            "script_length": len(script),
+            "word_count": len(script.split())
+        }
     
     def generate_voiceover(self, script, output_path, voice_criteria=None, voice_id=None, 
-                          model_id="eleven_turbo_v2", stability=0.5, similarity_boost=0.75):
+                          model_id="eleven_turbo_v2", stability=0.5, similarity_boost=0.75,
+                          split_first_sentence=False):
         """
         Generate a voiceover for a YouTube Short.
         
@@ -85,60 +220,189 @@ class AudioGenerator:
             model_id (str, optional): The ID of the model to use. Defaults to "eleven_turbo_v2".
             stability (float, optional): Voice stability (0-1). Defaults to 0.5.
             similarity_boost (float, optional): Voice similarity boost (0-1). Defaults to 0.75.
+            split_first_sentence (bool, optional): Synthesize the first sentence and the rest of an MP3
+                voiceover as two concurrent requests, then join them without re-encoding. Defaults to False.
             
         Returns:
             dict: A dictionary containing the output path and metadata
         """
-        # If voice_criteria is provided but not voice_id, find a matching voice
-        if not voice_id and voice_criteria:
-            voice = self.find_voice(voice_criteria)
-            if voice:
-                voice_id = voice.get("voice_id")
-                voice_name = voice.get("name")
-            else:
-                # If no matching voice is found, use a default voice
-                voices = self.list_voices()
-                if voices:
-                    voice_id = voices[0].get("voice_id")
-                    voice_name = voices[0].get("name")
-                else:
-                    raise ValueError("No voices available")
-        elif voice_id:
-            # If voice_id is provided, get the voice name
-            voices = self.list_voices()
-            voice_name = next((v.get("name") for v in voices if v.get("voice_id") == voice_id), "Unknown")
-        else:
-            # If neither voice_id nor voice_criteria is provided, use a default voice
-            voices = self.list_voices()
-            if voices:
-                voice_id = voices[0].get("voice_id")
-                voice_name = voices[0].get("name")
-            else:
-                raise ValueError("No voices available")
+        voice_id, voice_name = self._resolve_voice(voice_criteria, voice_id)
+        
+        settings = {
+            "voice_id": voice_id,
+            "model_id": model_id,
+            "stability": stability,
+            "similarity_boost": similarity_boost
+        }
         
         # Generate the voiceover
-        output_file = self.client.generate_and_save_speech(
-            text=script,
-            output_path=output_path,
-            voice_id=voice_id,
-            model_id=model_id,
-            stability=stability,
-            similarity_boost=similarity_boost
-        )
+        if split_first_sentence and ". " in script and output_path.lower().endswith(".mp3"):
+            output_file = self._generate_split_voiceover(script, output_path, settings)
+        else:
+            output_file = self.client.generate_and_save_speech(text=script, output_path=output_path, **settings)
         
         return {
             "output_path": output_file,
-            "metadata": {
-                "voice_id": voice_id,
-                "voice_name": voice_name,
-                "model_id": model_id,
-                "stability": stability,
-                "similarity_boost": similarity_boost,
-                "script_length": len(script),
-                "word_count": len(script.split())
-            }
+            "metadata": self._voiceover_metadata(script, voice_id, voice_name, model_id, stability, similarity_boost)
         }
     
+    def _generate_split_voiceover(self, script, output_path, settings):
+        """
+        Synthesize the first sentence and the remainder concurrently and join them.
+        
+        The first part is usually short, so it lands on disk well before the
+        full script would, and both requests overlap instead of running back to back.
+        
+        Args:
+            script (str): The script text to convert to speech
+            output_path (str): The path to save the joined MP3 file to
+            settings (dict): voice_id, model_id, stability and similarity_boost for the requests
+            
+        Returns:
+            str: The path to the saved audio file
+        """
+        first, rest = script.split(". ", 1)
+        base_path = os.path.splitext(output_path)[0]
+        part_paths = [f"{base_path}.part1.mp3", f"{base_path}.part2.mp3"]
+        
+        try:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                futures = [
+                    # Run each part in a copy of the caller's context so its caching setting applies
+                    executor.submit(contextvars.copy_context().run, self.client.generate_and_save_speech,
+                                    text=text, output_path=path, **settings)
+                    for text, path in zip([first + ".", rest], part_paths)
+                ]
+                for future in futures:
+                    future.result()
+            
+            _concat_mp3(part_paths, output_path)
+        finally:
+            for path in part_paths:
+                if os.path.exists(path):
+                    os.remove(path)
+        
+        return output_path
+    
+    def async_client(self, max_connections=4):
+        """
+        Create an async client that shares this generator's API key and cache.
+        
+        Open it with "async with" and pass it to generate_voiceover_async, so that a
+        batch of voiceovers reuses one connection pool.
+        
+        Args:
+            max_connections (int, optional): Maximum number of open connections. Defaults to 4.
+            
+        Returns:
+            AsyncElevenLabsClient: The client, not yet opened
+        """
+        from .async_elevenlabs_client import AsyncElevenLabsClient
+        
+        return AsyncElevenLabsClient(self.client.api_key, max_connections=max_connections,
+                                     api_cache=self.client.api_cache)
+    
+    async def generate_voiceover_async(self, script, output_path, voice_criteria=None, voice_id=None,
+                                       model_id="eleven_turbo_v2", stability=0.5, similarity_boost=0.75,
+                                       pool=None, client=None):
+        """
+        Generate a voiceover using the async client.
+        
+        Args:
+            script (str): The script text to convert to speech
+            output_path (str): The path to save the audio file to
+            voice_criteria (dict, optional): Criteria to match for voice selection. Defaults to None.
+            voice_id (str, optional): Specific voice ID to use. Defaults to None.
+            model_id (str, optional): The ID of the model to use. Defaults to "eleven_turbo_v2".
+            stability (float, optional): Voice stability (0-1). Defaults to 0.5.
+            similarity_boost (float, optional): Voice similarity boost (0-1). Defaults to 0.75.
+            pool (RequestPool, optional): Pool to queue the request on. Defaults to None (run immediately).
+            client (AsyncElevenLabsClient, optional): Open client from async_client to send the request
+                over. Defaults to None (open one for this request).
+            
+        Returns:
+            dict: A dictionary containing the output path and metadata
+        """
+        if client is None:
+            async with self.async_client(max_connections=1) as client:
+                return await self.generate_voiceover_async(
+                    script=script,
+                    output_path=output_path,
+                    voice_criteria=voice_criteria,
+                    voice_id=voice_id,
+                    model_id=model_id,
+                    stability=stability,
+                    similarity_boost=similarity_boost,
+                    pool=pool,
+                    client=client
+                )
+        
+        # Resolving the voice may call the blocking voices endpoint, so do it off the event loop
+        voice_id, voice_name = await asyncio.to_thread(self._resolve_voice, voice_criteria, voice_id)
+        
+        request = {
+            "text": script,
+            "output_path": output_path,
+            "voice_id": voice_id,
+            "model_id": model_id,
+            "stability": stability,
+            "similarity_boost": similarity_boost
+        }
+        if pool is not None:
+            output_file = await pool.submit(client.generate_and_save_speech, **request)
+        else:
+            output_file = await client.generate_and_save_speech(**request)
+        
+        return {
+            "output_path": output_file,
+            "metadata": self._voiceover_metadata(script, voice_id, voice_name, model_id, stability, similarity_boost)
+        }
+    
+    async def generate_voiceovers(self, jobs, max_concurrency=4):
+        """
+        Generate several voiceovers concurrently.
+        
+        Args:
+            jobs (list): List of dicts with the keyword arguments accepted by generate_voiceover
+                (script, output_path and optionally voice_criteria, voice_id, model_id, stability, similarity_boost)
+            max_concurrency (int, optional): Maximum number of requests in flight. Defaults to 4.
+            
+        Returns:
+            list: Results in the same order as jobs, each shaped like the generate_voiceover result
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        def resolve_voices():
+            return [self._resolve_voice(job.get("voice_criteria"), job.get("voice_id")) for job in jobs]
+        
+        async def run(client, job, voice):
+            model_id = job.get("model_id", "eleven_turbo_v2")
+            stability = job.get("stability", 0.5)
+            similarity_boost = job.get("similarity_boost", 0.75)
+            voice_id, voice_name = voice
+            
+            async with semaphore:
+                output_file = await client.generate_and_save_speech(
+                    text=job["script"],
+                    output_path=job["output_path"],
+                    voice_id=voice_id,
+                    model_id=model_id,
+                    stability=stability,
+                    similarity_boost=similarity_boost
+                )
+            
+            return {
+                "output_path": output_file,
+                "metadata": self._voiceover_metadata(job["script"], voice_id, voice_name, model_id, stability, similarity_boost)
+            }
+        
+        # Resolving a voice may call the blocking voices endpoint, so do it once, off the event loop
+        voices = await asyncio.to_thread(resolve_voices)
+        
+        async with self.async_client(max_connections=max_concurrency) as client:
+            tasks = [asyncio.create_task(run(client, job, voice)) for job, voice in zip(jobs, voices)]
+            return await asyncio.gather(*tasks)
+    
     def optimize_script_for_tts(self, script):
         """
         Optimize a script for text-to-speech by adding SSML tags or formatting.
@@ -150,22 +414,7 @@ class AudioGenerator:
             str: The optimized script
         """
         # This is a simple implementation that could be expanded with more sophisticated SSML
-        
-        # Add pauses after sentences
-        script = script.replace(". ", ". <break time='0.3s'/> ")
-        script = script.replace("! ", "! <break time='0.3s'/> ")
-        script = script.replace("? ", "? <break time='0.3s'/> ")
-        
-        # Emphasize questions
-        lines = script.split("\n")
-        for i, line in enumerate(lines):
-            if "?" in line:
-                lines[i] = f"<emphasis level='moderate'>{line}</emphasis>"
-        
-        # Wrap in SSML tags
-        optimized_script = "<speak>\n" + "\n".join(lines) + "\n</speak>"
-        
-        return optimized_script
+        return _optimize_script(script)
 
 
 if __name__ == "__main__":
@@ -4,11 +4,18 @@ This module handles the interaction with ElevenLabs' API to generate voiceovers
 """
 
 import os
-import requests
-import json
-from dotenv import load_dotenv
+import hashlib
+import tempfile
+from ..env_utils import load_env
+from ..file_utils import ensure_dir
+from ..http_utils import create_session, parse_json, loads, dumps
+from ..api_cache import memoize_api
 import time
 
+# On-disk cache for the voices list, shared between processes
+VOICES_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "yt_shorts_ai")
+VOICES_CACHE_TTL = 24 * 60 * 60  # 24 hours
+
 class ElevenLabsClient:
     """Client for interacting with ElevenLabs' API to generate voice content."""
     
@@ -19,7 +26,7 @@ class ElevenLabsClient:
         Args:
             api_key (str, optional): ElevenLabs API key. If not provided, will look for ELEVENLABS_API_KEY in environment variables.
         """
-        load_dotenv()
+        load_env()
         self.api_key = api_key or os.getenv("ELEVENLABS_API_KEY")
         if not self.api_key:
             raise ValueError("ElevenLabs API key is required. Set it as ELEVENLABS_API_KEY environment variable or pass it to the constructor.")
@@ -29,17 +36,81 @@ class ElevenLabsClient:
             "xi-api-key": self.api_key,
             "Content-Type": "application/json"
         }
+        
+        # Pooled session: reuses connections across calls and retries transient errors
+        self.session = create_session()
+        
+        # Voices differ per account, so key the cache file on the API key
+        key_hash = hashlib.sha256(self.api_key.encode()).hexdigest()[:16]
+        self.voices_cache_path = os.path.join(VOICES_CACHE_DIR, f"voices_{key_hash}.json")
+        self._voices_by_name = None
+        
+        # Set by the pipeline to reuse results of identical calls; None disables caching
+        self.api_cache = None
     
-    def get_voices(self):
+    def _read_voices_cache(self):
+        """
+        Read the voices list from the on-disk cache if it is still fresh.
+        
+        Returns:
+            list: Cached voices or None if the cache is missing or expired
+        """
+        try:
+            if os.path.getmtime(self.voices_cache_path) < time.time() - VOICES_CACHE_TTL:
+                return None
+            with open(self.voices_cache_path, "rb") as f:
+                return loads(f.read())
+        except (OSError, ValueError):
+            return None
+    
+    def _write_voices_cache(self, voices):
+        """
+        Atomically rewrite the on-disk voices cache.
+        
+        Args:
+            voices (list): The voices to cache
+        """
+        try:
+            ensure_dir(os.path.dirname(self.voices_cache_path))
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.voices_cache_path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(dumps(voices))
+            os.replace(tmp_path, self.voices_cache_path)
+        except OSError:
+            # The cache is only an optimization, so a read-only home directory is not an error
+            pass
+    
+    def get_cached_voices(self):
+        """
+        Get the voices list from the on-disk cache without calling the API.
+        
+        Returns:
+            list: Cached voices or None if the cache is missing or expired
+        """
+        return self._read_voices_cache()
+    
+    def get_voices(self, refresh=False):
         """
         Get available voices from ElevenLabs.
         
+        Args:
+            refresh (bool, optional): Whether to bypass the on-disk cache and refetch. Defaults to False.
+        
         Returns:
             list: Available voices
         """
-        response = requests.get(f"{self.base_url}/voices", headers=self.headers)
+        if not refresh:
+            voices = self._read_voices_cache()
+            if voices is not None:
+                return voices
+        
+        response = self.session.get(f"{self.base_url}/voices", headers=self.headers)
         response.raise_for_status()
-        return response.json().get("voices", [])
+        voices = parse_json(response).get("voices", [])
+        
+        self._write_voices_cache(voices)
+        self._voices_by_name = None
+        return voices
     
     def get_voice_by_name(self, name):
         """
@@ -51,28 +122,29 @@ class ElevenLabsClient:
         Returns:
             dict: Voice information or None if not found
         """
-        voices = self.get_voices()
-        for voice in voices:
-            if voice.get("name", "").lower() == name.lower():
-                return voice
-        return None
+        if self._voices_by_name is None:
+            # Keep the first voice for each name, matching a linear scan
+            self._voices_by_name = {}
+            for voice in self.get_voices():
+                self._voices_by_name.setdefault(voice.get("name", "").lower(), voice)
+        return self._voices_by_name.get(name.lower())
     
-    def generate_speech(self, text, voice_id, model_id="eleven_turbo_v2", stability=0.5, similarity_boost=0.75, output_format="mp3"):
+    def _request_speech(self, text, voice_id, model_id, stability, similarity_boost, output_format):
         """
-        Generate speech from text using ElevenLabs API.
+        Start a streaming text-to-speech request.
         
         Args:
             text (str): The text to convert to speech
             voice_id (str): The ID of the voice to use
-            model_id (str, optional): The ID of the model to use. Defaults to "eleven_turbo_v2".
-            stability (float, optional): Voice stability (0-1). Defaults to 0.5.
-            similarity_boost (float, optional): Voice similarity boost (0-1). Defaults to 0.75.
-            output_format (str, optional): Output audio format. Defaults to "mp3".
+            model_id (str): The ID of the model to use
+            stability (float): Voice stability (0-1)
+            similarity_boost (float): Voice similarity boost (0-1)
+            output_format (str): Output audio format
             
         Returns:
-            bytes: Audio data
+            requests.Response: Streaming response with the audio data
         """
-        url = f"{self.base_url}/text-to-speech/{voice_id}"
+        url = f"{self.base_url}/text-to-speech/{voice_id}/stream"
         
         payload = {
             "text": text,
@@ -86,9 +158,32 @@ class ElevenLabsClient:
         headers = self.headers.copy()
         headers["Accept"] = f"audio/{output_format}"
         
-        response = requests.post(url, json=payload, headers=headers)
+        params = {"optimize_streaming_latency": 3}
+        if output_format == "mp3":
+            params["output_format"] = "mp3_44100_128"
+        
+        response = self.session.post(url, json=payload, headers=headers, params=params, stream=True)
         response.raise_for_status()
         
+        return response
+    
+    def generate_speech(self, text, voice_id, model_id="eleven_turbo_v2", stability=0.5, similarity_boost=0.75, output_format="mp3"):
+        """
+        Generate speech from text using ElevenLabs API.
+        
+        Args:
+            text (str): The text to convert to speech
+            voice_id (str): The ID of the voice to use
+            model_id (str, optional): The ID of the model to use. Defaults to "eleven_turbo_v2".
+            stability (float, optional): Voice stability (0-1). Defaults to 0.5.
+            similarity_boost (float, optional): Voice similarity boost (0-1). Defaults to 0.75.
+            output_format (str, optional): Output audio format. Defaults to "mp3".
+            
+        Returns:
+            bytes: Audio data
+        """
+        response = self._request_speech(text, voice_id, model_id, stability, similarity_boost, output_format)
+        
         return response.content
     
     def save_audio(self, audio_data, output_path):
@@ -96,19 +191,25 @@ class ElevenLabsClient:
         Save audio data to a file.
         
         Args:
-            audio_data (bytes): The audio data to save
+            audio_data (bytes or iterable): The audio data to save, either as bytes or as an iterable of byte chunks
             output_path (str): The path to save the audio file to
             
         Returns:
             str: The path to the saved audio file
         """
-        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        ensure_dir(os.path.dirname(os.path.abspath(output_path)))
+        
+        if isinstance(audio_data, (bytes, bytearray)):
+            audio_data = [audio_data]
         
         with open(output_path, "wb") as f:
-            f.write(audio_data)
+            for chunk in audio_data:
+                if chunk:
+                    f.write(chunk)
         
         return output_path
     
+    @memoize_api
     def generate_and_save_speech(self, text, output_path, voice_id=None, voice_name=None, model_id="eleven_turbo_v2", 
                                 stability=0.5, similarity_boost=0.75):
         """
@@ -142,8 +243,8 @@ class ElevenLabsClient:
             else:
                 raise ValueError("No voices available")
         
-        # Generate the speech
-        audio_data = self.generate_speech(
+        # Generate the speech and write chunks to disk as they arrive
+        response = self._request_speech(
             text=text,
             voice_id=voice_id,
             model_id=model_id,
@@ -153,7 +254,8 @@ class ElevenLabsClient:
         )
         
         # Save the audio
-        return self.save_audio(audio_data, output_path)
+        with response:
+            return self.save_audio(response.iter_content(chunk_size=4096), output_path)
 
 
 if __name__ == "__main__":
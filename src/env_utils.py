@@ -0,0 +1,20 @@
+"""
+Environment helpers for the YouTube Shorts AI Pipeline.
+This module reads the .env file once per process instead of once per API client.
+"""
+
+from functools import lru_cache
+
+@lru_cache(maxsize=None)
+def load_env():
+    """
+    Load variables from the .env file into the environment, once per process.
+
+    Variables already set in the environment are left unchanged, as with load_dotenv.
+
+    Returns:
+        bool: Whether a .env file was found and loaded
+    """
+    from dotenv import load_dotenv
+
+    return load_dotenv()
@@ -0,0 +1,86 @@
+"""
+Shared file system helpers for the YouTube Shorts AI Pipeline.
+This module avoids repeating directory setup for every file a batch writes,
+and publishing finished files with a byte-for-byte copy when a link will do.
+"""
+
+import os
+import shutil
+import uuid
+from contextlib import contextmanager
+
+# Directories already created (or found) by this process
+_ENSURED_DIRS = set()
+
+def ensure_dir(directory):
+    """
+    Create a directory (and parents) once per process.
+
+    Later calls for the same directory return without touching the file system,
+    so a directory removed while the process is running is not recreated.
+
+    Args:
+        directory (str): The directory to create
+
+    Returns:
+        str: The absolute path of the directory
+    """
+    directory = os.path.abspath(directory)
+    if directory not in _ENSURED_DIRS:
+        os.makedirs(directory, exist_ok=True)
+        _ENSURED_DIRS.add(directory)
+    return directory
+
+def link_or_copy(src, dst):
+    """
+    Make dst a hard link to src, copying the file only if linking is not possible.
+
+    A link costs no I/O but shares the file's data, so both names must only ever
+    be replaced, never rewritten in place; writers use atomic_output for that.
+    An existing dst is replaced. Files on another file system, or on one without
+    hard links, are copied instead.
+
+    Args:
+        src (str): The file to publish
+        dst (str): The path to publish it at
+
+    Returns:
+        str: The destination path
+    """
+    try:
+        os.remove(dst)
+    except FileNotFoundError:
+        pass
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+    return dst
+
+@contextmanager
+def atomic_output(path):
+    """
+    Write a file under a temporary name next to path and move it into place once complete.
+
+    Tools like ffmpeg -y truncate an existing output and rewrite it in place, which
+    would also rewrite every hard link to it. Replacing the directory entry instead
+    leaves linked names untouched, and a failed write leaves the old file intact.
+
+    Args:
+        path (str): The file to write
+
+    Yields:
+        str: The temporary path to write to; it keeps path's extension, so tools
+            that pick the format from it still do
+    """
+    directory = ensure_dir(os.path.dirname(os.path.abspath(path)))
+    name, ext = os.path.splitext(os.path.basename(path))
+    # Left for the writer to create, so the file gets the usual permissions rather than mkstemp's 0600
+    tmp_path = os.path.join(directory, f".{name}.{uuid.uuid4().hex[:8]}{ext}")
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
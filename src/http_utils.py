@@ -0,0 +1,118 @@
+"""
+Shared HTTP helpers for the API clients in the YouTube Shorts AI Pipeline.
+This module builds the pooled, retrying requests sessions used by each client and decodes JSON payloads.
+"""
+
+import json
+import time
+import requests
+from email.utils import parsedate_to_datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Statuses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+def create_session(pool_connections=8, pool_maxsize=32):
+    """
+    Create a requests session with connection pooling and retries.
+
+    Transient failures (429 and 5xx) are retried with exponential backoff and
+    jitter, honoring any Retry-After header. Only idempotent methods are
+    retried, so a POST that starts a generation is never submitted twice.
+
+    Args:
+        pool_connections (int, optional): Number of host connection pools to cache. Defaults to 8.
+        pool_maxsize (int, optional): Maximum connections kept per host. Defaults to 32.
+
+    Returns:
+        requests.Session: The configured session
+    """
+    retry = Retry(
+        total=5,
+        backoff_factor=0.5,
+        backoff_jitter=0.5,
+        status_forcelist=RETRY_STATUSES,
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def retry_after_s(headers, default=5.0):
+    """
+    Read a Retry-After header as a number of seconds to wait.
+
+    Args:
+        headers (Mapping): The response headers
+        default (float, optional): Wait to use when the header is missing or invalid. Defaults to 5.0.
+
+    Returns:
+        float: Seconds to wait before retrying
+    """
+    value = headers.get("Retry-After")
+    if value is None:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    # Retry-After may also be an HTTP date
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return default
+
+def parse_json(response):
+    """
+    Parse a JSON response body, using orjson when it is installed.
+
+    Args:
+        response (requests.Response): The response to parse
+
+    Returns:
+        The decoded JSON value
+    """
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+def loads(data):
+    """
+    Decode a JSON document, using orjson when it is installed.
+
+    Args:
+        data (str or bytes): The JSON document
+
+    Returns:
+        The decoded JSON value
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dumps(obj, indent=False):
+    """
+    Encode a value as a JSON document, using orjson when it is installed.
+
+    Args:
+        obj: The value to encode
+        indent (bool, optional): Whether to indent by two spaces instead of writing compact JSON. Defaults to False.
+
+    Returns:
+        bytes: The JSON document
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+    if indent:
+        return json.dumps(obj, indent=2).encode()
+    return json.dumps(obj, separators=(",", ":")).encode()
@@ -4,9 +4,31 @@ This module provides a simplified interface for generating background music for
 """
 
 import os
+import asyncio
+import subprocess
+import tempfile
 from .suno_client import SunoClient
 from pydub import AudioSegment
 
+def _duration_s(path):
+    """
+    Get the duration of an audio file from its container metadata.
+    
+    Args:
+        path (str): Path to the audio file
+        
+    Returns:
+        float: Duration in seconds
+    """
+    try:
+        output = subprocess.check_output(
+            ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", path]
+        )
+        return float(output)
+    except (FileNotFoundError, ValueError):
+        # ffprobe is missing or reported no duration, so decode the file instead
+        return len(AudioSegment.from_file(path)) / 1000  # Convert milliseconds to seconds
+
 class MusicGenerator:
     """Music generation component for YouTube Shorts pipeline."""
     
@@ -45,8 +67,7 @@ class MusicGenerator:
         )
         
         # Get the actual duration of the generated music
-        audio = AudioSegment.from_file(music_path)
-        actual_duration = len(audio) / 1000  # Convert milliseconds to seconds
+        actual_duration = _duration_s(music_path)
         
         return {
             "output_path": music_path,
@@ -60,76 +81,196 @@ class MusicGenerator:
             }
         }
     
-    def adjust_music_duration(self, music_path, target_duration, output_path=None):
+    def get_audio_duration(self, audio_path):
         """
-        Adjust the duration of a music file to match a target duration.
+        Get the duration of an audio file without decoding it.
+        
+        Args:
+            audio_path (str): Path to the audio file
+            
+        Returns:
+            float: Duration in seconds
+        """
+        return _duration_s(audio_path)
+    
+    async def generate_background_music_async(self, prompt, output_path, duration=30, genre=None, mood=None, tempo=None, pool=None):
+        """
+        Generate background music without blocking the event loop.
+        
+        The Suno client polls synchronously, so the work runs in a worker thread
+        and can overlap with other awaitables such as voiceover generation.
+        
+        Args:
+            prompt (str): The text prompt describing the music
+            output_path (str): The path to save the audio file to
+            duration (int, optional): Approximate duration in seconds. Defaults to 30.
+            genre (str, optional): Music genre. Defaults to None.
+            mood (str, optional): Mood of the music. Defaults to None.
+            tempo (str, optional): Tempo of the music. Defaults to None.
+            pool (RequestPool, optional): Pool to queue the request on. Defaults to None (run immediately).
+            
+        Returns:
+            dict: A dictionary containing the output path and metadata
+        """
+        if pool is not None:
+            return await pool.submit(
+                self.generate_background_music_async,
+                prompt=prompt,
+                output_path=output_path,
+                duration=duration,
+                genre=genre,
+                mood=mood,
+                tempo=tempo
+            )
+        
+        return await asyncio.to_thread(
+            self.generate_background_music,
+            prompt=prompt,
+            output_path=output_path,
+            duration=duration,
+            genre=genre,
+            mood=mood,
+            tempo=tempo
+        )
+    
+    def _adjust(self, music_path, target_duration=None, volume_db=None, output_path=None):
+        """
+        Adjust the duration and/or volume of a music file with a single decode and encode.
         
         Args:
             music_path (str): Path to the input music file
-            target_duration (float): Target duration in seconds
+            target_duration (float, optional): Target duration in seconds. Defaults to None (keep duration).
+            volume_db (float, optional): Volume adjustment in decibels. Defaults to None (keep volume).
             output_path (str, optional): Path to save the adjusted music. Defaults to None (overwrites input).
             
         Returns:
-            str: Path to the adjusted music file
+            str: Path to the adjusted music file, or the input path if nothing needed to change
         """
         if not output_path:
             output_path = music_path
         
+        # Only touch the duration if it is not already close to the target
+        adjust_duration = target_duration is not None and abs(_duration_s(music_path) - target_duration) >= 1
+        
+        if not adjust_duration and volume_db is None:
+            return music_path
+        
+        # Let ffmpeg loop, trim, fade and apply gain in one filter chain without
+        # decoding into Python memory
+        try:
+            return self._ffmpeg_adjust(
+                music_path,
+                output_path,
+                target_duration=target_duration if adjust_duration else None,
+                volume_db=volume_db
+            )
+        except FileNotFoundError:
+            # ffmpeg is not installed, fall back to pydub
+            pass
+        
         # Load the audio
         audio = AudioSegment.from_file(music_path)
         current_duration = len(audio) / 1000  # Convert milliseconds to seconds
         
-        # If current duration is already close to target, just return
-        if abs(current_duration - target_duration) < 1:
-            return music_path
+        if adjust_duration:
+            # If current duration is shorter than target, loop the audio
+            if current_duration < target_duration:
+                # Calculate how many times to loop
+                repeat_count = int(target_duration / current_duration) + 1
+                # Create a new audio by concatenating the original multiple times
+                extended_audio = audio * repeat_count
+                # Trim to match target duration
+                audio = extended_audio[:int(target_duration * 1000)]
+            else:
+                # If current duration is longer than target, trim the audio
+                audio = audio[:int(target_duration * 1000)]
         
-        # If current duration is shorter than target, loop the audio
-        if current_duration < target_duration:
-            # Calculate how many times to loop
-            repeat_count = int(target_duration / current_duration) + 1
-            # Create a new audio by concatenating the original multiple times
-            extended_audio = audio * repeat_count
-            # Trim to match target duration
-            adjusted_audio = extended_audio[:int(target_duration * 1000)]
-        else:
-            # If current duration is longer than target, trim the audio
-            adjusted_audio = audio[:int(target_duration * 1000)]
-        
-        # Add fade out at the end
-        fade_duration = min(3000, int(target_duration * 1000 * 0.1))  # 10% of duration or 3 seconds, whichever is shorter
-        adjusted_audio = adjusted_audio.fade_out(fade_duration)
+        # Adjust volume
+        if volume_db is not None:
+            audio = audio + volume_db
+        
+        if adjust_duration:
+            # Add fade out at the end
+            fade_duration = min(3000, int(target_duration * 1000 * 0.1))  # 10% of duration or 3 seconds, whichever is shorter
+            audio = audio.fade_out(fade_duration)
         
         # Save the adjusted audio
-        adjusted_audio.export(output_path, format=output_path.split(".")[-1])
+        audio.export(output_path, format=output_path.split(".")[-1])
         
         return output_path
     
-    def adjust_music_volume(self, music_path, volume_adjustment_db, output_path=None):
+    def _ffmpeg_adjust(self, music_path, output_path, target_duration=None, volume_db=None):
         """
-        Adjust the volume of a music file.
+        Loop/trim, fade out and adjust the volume of a music file using a single ffmpeg pass.
         
         Args:
             music_path (str): Path to the input music file
-            volume_adjustment_db (float): Volume adjustment in decibels (negative values reduce volume)
-            output_path (str, optional): Path to save the adjusted music. Defaults to None (overwrites input).
+            output_path (str): Path to save the adjusted music (may be the input path)
+            target_duration (float, optional): Target duration in seconds. Defaults to None (keep duration).
+            volume_db (float, optional): Volume adjustment in decibels. Defaults to None (keep volume).
             
         Returns:
             str: Path to the adjusted music file
         """
-        if not output_path:
-            output_path = music_path
+        input_args = ["-i", music_path]
+        filters = []
         
-        # Load the audio
-        audio = AudioSegment.from_file(music_path)
+        if target_duration is not None:
+            fade_duration = min(3.0, target_duration * 0.1)  # 10% of duration or 3 seconds, whichever is shorter
+            input_args = ["-stream_loop", "-1", "-i", music_path, "-t", str(target_duration)]
+            filters.append(f"afade=t=out:st={target_duration - fade_duration}:d={fade_duration}")
         
-        # Adjust volume
-        adjusted_audio = audio + volume_adjustment_db
+        if volume_db is not None:
+            filters.append(f"volume={volume_db}dB")
         
-        # Save the adjusted audio
-        adjusted_audio.export(output_path, format=output_path.split(".")[-1])
+        extension = os.path.splitext(output_path)[1]
+        codec_args = ["-c:a", "libmp3lame", "-q:a", "2"] if extension.lower() == ".mp3" else []
+        
+        # ffmpeg cannot write over its own input, so render to a temporary file first
+        output_dir = os.path.dirname(os.path.abspath(output_path))
+        fd, temp_path = tempfile.mkstemp(suffix=extension, dir=output_dir)
+        os.close(fd)
+        
+        try:
+            subprocess.run(
+                ["ffmpeg", "-y", "-v", "error", *input_args, "-af", ",".join(filters), *codec_args, temp_path],
+                check=True
+            )
+            os.replace(temp_path, output_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
         
         return output_path
     
+    def adjust_music_duration(self, music_path, target_duration, output_path=None):
+        """
+        Adjust the duration of a music file to match a target duration.
+        
+        Args:
+            music_path (str): Path to the input music file
+            target_duration (float): Target duration in seconds
+            output_path (str, optional): Path to save the adjusted music. Defaults to None (overwrites input).
+            
+        Returns:
+            str: Path to the adjusted music file
+        """
+        return self._adjust(music_path, target_duration=target_duration, output_path=output_path)
+    
+    def adjust_music_volume(self, music_path, volume_adjustment_db, output_path=None):
+        """
+        Adjust the volume of a music file.
+        
+        Args:
+            music_path (str): Path to the input music file
+            volume_adjustment_db (float): Volume adjustment in decibels (negative values reduce volume)
+            output_path (str, optional): Path to save the adjusted music. Defaults to None (overwrites input).
+            
+        Returns:
+            str: Path to the adjusted music file
+        """
+        return self._adjust(music_path, volume_db=volume_adjustment_db, output_path=output_path)
+    
     def create_music_for_voiceover(self, prompt, voiceover_path, output_path, volume_reduction_db=-10):
         """
         Create background music that complements a voiceover.
@@ -144,8 +285,7 @@ class MusicGenerator:
             dict: A dictionary containing the output path and metadata
         """
         # Get the duration of the voiceover
-        voiceover = AudioSegment.from_file(voiceover_path)
-        voiceover_duration = len(voiceover) / 1000  # Convert milliseconds to seconds
+        voiceover_duration = _duration_s(voiceover_path)
         
         # Generate music with matching duration
         result = self.generate_background_music(
@@ -155,27 +295,40 @@ class MusicGenerator:
             mood="Background"  # Specify background mood for better results with voiceover
         )
         
-        # Adjust the music duration to match the voiceover exactly
-        adjusted_path = self.adjust_music_duration(
-            music_path=result["output_path"],
-            target_duration=voiceover_duration
-        )
+        return self.fit_music_to_voiceover(result, voiceover_path, volume_reduction_db, voiceover_duration)
+    
+    def fit_music_to_voiceover(self, music_result, voiceover_path, volume_reduction_db=-10, voiceover_duration=None):
+        """
+        Fit generated background music to a finished voiceover.
+        
+        Args:
+            music_result (dict): Result returned by generate_background_music
+            voiceover_path (str): Path to the voiceover audio file
+            volume_reduction_db (float, optional): Volume reduction in decibels. Defaults to -10.
+            voiceover_duration (float, optional): Voiceover duration in seconds, if already known. Defaults to None.
+            
+        Returns:
+            dict: The music result with its output path and metadata updated
+        """
+        if voiceover_duration is None:
+            voiceover_duration = _duration_s(voiceover_path)
         
-        # Reduce the volume to avoid overpowering the voiceover
-        final_path = self.adjust_music_volume(
-            music_path=adjusted_path,
-            volume_adjustment_db=volume_reduction_db
+        # Match the voiceover duration and reduce the volume to avoid overpowering
+        # the voiceover in one decode/encode pass
+        final_path = self._adjust(
+            music_path=music_result["output_path"],
+            target_duration=voiceover_duration,
+            volume_db=volume_reduction_db
         )
         
         # Update the metadata
-        result["output_path"] = final_path
-        result["metadata"].update({
+        music_result["output_path"] = final_path
+        music_result["metadata"].update({
             "voiceover_duration": voiceover_duration,
             "volume_adjustment": volume_reduction_db
         })
         
-        return result
-
+        return music_result
 
 if __name__ == "__main__":
     # Example usage
@@ -4,10 +4,12 @@ This module handles the interaction with Suno's API to generate background music
 """
 
 import os
-import requests
-import json
 import time
-from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor
+from ..env_utils import load_env
+from ..file_utils import ensure_dir
+from ..http_utils import create_session, parse_json
+from ..api_cache import memoize_api
 
 class SunoClient:
     """Client for interacting with Suno's API to generate music content."""
@@ -19,7 +21,7 @@ class SunoClient:
         Args:
             api_key (str, optional): Suno API key. If not provided, will look for SUNO_API_KEY in environment variables.
         """
-        load_dotenv()
+        load_env()
         self.api_key = api_key or os.getenv("SUNO_API_KEY")
         if not self.api_key:
             raise ValueError("Suno API key is required. Set it as SUNO_API_KEY environment variable or pass it to the constructor.")
@@ -29,7 +31,15 @@ class SunoClient:
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
+        
+        # Pooled session: reuses connections across the submit, poll and download
+        # requests and retries transient errors
+        self.session = create_session()
+        
+        # Set by the pipeline to reuse results of identical calls; None disables caching
+        self.api_cache = None
     
+    @memoize_api
     def generate_music(self, prompt, output_path, duration=30, genre=None, mood=None, tempo=None):
         """
         Generate music from a text prompt using Suno's API.
@@ -64,23 +74,24 @@ class SunoClient:
         }
         
         # Start the generation
-        response = requests.post(url, json=payload, headers=self.headers)
+        response = self.session.post(url, json=payload, headers=self.headers)
         response.raise_for_status()
         
         # Get the generation ID
-        generation_id = response.json().get("id")
+        generation_id = parse_json(response).get("id")
         if not generation_id:
             raise ValueError("Failed to get generation ID from Suno API")
         
-        # Poll for completion
+        # Poll for completion, backing off from 0.5 seconds up to 5 seconds between checks
         status_url = f"{self.base_url}/generations/{generation_id}"
-        max_attempts = 60  # 5 minutes with 5-second intervals
+        deadline = time.monotonic() + 300  # 5 minutes
+        delay = 0.5
         
-        for attempt in range(max_attempts):
-            status_response = requests.get(status_url, headers=self.headers)
+        while time.monotonic() < deadline:
+            status_response = self.session.get(status_url, headers=self.headers)
             status_response.raise_for_status()
             
-            status_data = status_response.json()
+            status_data = parse_json(status_response)
             status = status_data.get("status")
             
             if status == "completed":
@@ -89,22 +100,17 @@ class SunoClient:
                 if not audio_url:
                     raise ValueError("No audio URL in completed generation")
                 
-                audio_response = requests.get(audio_url)
-                audio_response.raise_for_status()
-                
-                # Save the audio
-                os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
-                with open(output_path, "wb") as f:
-                    f.write(audio_response.content)
-                
-                return output_path
+                # Stream the audio straight to disk
+                ensure_dir(os.path.dirname(os.path.abspath(output_path)))
+                return self._download_file(audio_url, output_path)
             
             elif status == "failed":
                 error = status_data.get("error", "Unknown error")
                 raise ValueError(f"Suno generation failed: {error}")
             
             # Wait before polling again
-            time.sleep(5)
+            time.sleep(delay)
+            delay = min(delay * 1.5, 5.0)
         
         raise TimeoutError("Suno generation timed out")
     
@@ -121,25 +127,41 @@ class SunoClient:
         """
         url = f"{self.base_url}/generations/{generation_id}/stems"
         
-        response = requests.get(url, headers=self.headers)
+        response = self.session.get(url, headers=self.headers)
         response.raise_for_status()
         
-        stems_data = response.json().get("stems", {})
-        stem_files = {}
+        stems_data = parse_json(response).get("stems", {})
+        if not stems_data:
+            return {}
         
-        os.makedirs(output_dir, exist_ok=True)
+        ensure_dir(output_dir)
         
-        for stem_name, stem_url in stems_data.items():
-            stem_response = requests.get(stem_url)
-            stem_response.raise_for_status()
-            
-            stem_path = os.path.join(output_dir, f"{stem_name}.mp3")
-            with open(stem_path, "wb") as f:
-                f.write(stem_response.content)
+        # Stems are independent, so download them concurrently
+        with ThreadPoolExecutor(max_workers=min(8, len(stems_data))) as executor:
+            stem_paths = executor.map(
+                lambda item: self._download_file(item[1], os.path.join(output_dir, f"{item[0]}.mp3")),
+                stems_data.items()
+            )
+            return dict(zip(stems_data.keys(), stem_paths))
+    
+    def _download_file(self, url, output_path):
+        """
+        Stream a file to disk without buffering it in memory.
+        
+        Args:
+            url (str): URL of the file to download
+            output_path (str): The path to save the file to
             
-            stem_files[stem_name] = stem_path
+        Returns:
+            str: The path to the saved file
+        """
+        with self.session.get(url, stream=True) as response:
+            response.raise_for_status()
+            with open(output_path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=65536):
+                    f.write(chunk)
         
-        return stem_files
+        return output_path
 
 
 if __name__ == "__main__":
@@ -4,5 +4,6 @@ This file makes the directory a Python package and exposes key classes.
 """
 
 from .pipeline import YouTubeShortsCreator
+from .request_pool import RequestPool
 
-__all__ = ['YouTubeShortsCreator']
+__all__ = ['YouTubeShortsCreator', 'RequestPool']
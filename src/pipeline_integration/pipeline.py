@@ -4,29 +4,57 @@ This module combines all components to create complete YouTube Shorts videos.
 """
 
 import os
+import time
+import asyncio
+import functools
 import argparse
-import json
 import logging
 from datetime import datetime
-from dotenv import load_dotenv
 
 # Import all component modules
 from src.text_generation import TextGenerator
 from src.audio_generation import AudioGenerator
 from src.video_generation import VideoGenerator
 from src.music_generation import MusicGenerator
+from src.api_cache import APICache, caching
+from src.env_utils import load_env
+from src.file_utils import ensure_dir, link_or_copy
+from src.http_utils import dumps
+from .request_pool import RequestPool
 
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.FileHandler("pipeline.log"),
+        logging.FileHandler("pipeline.log", delay=True, encoding="utf-8"),  # Not opened until the first record
         logging.StreamHandler()
     ]
 )
 logger = logging.getLogger("youtube_shorts_pipeline")
 
+async def _gather_or_cancel(*aws):
+    """
+    Run awaitables concurrently, cancelling the rest if one of them fails.
+    
+    Unlike a plain asyncio.gather, the remaining tasks have finished by the time the
+    error propagates, so the clients and pools they use can be closed safely.
+    
+    Args:
+        *aws: The awaitables to run
+        
+    Returns:
+        list: Their results, in order
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
 class YouTubeShortsCreator:
     """Main pipeline class for creating YouTube Shorts videos."""
     
@@ -38,14 +66,14 @@ class YouTubeShortsCreator:
             config (dict, optional): Configuration dictionary. Defaults to None.
         """
         # Load environment variables
-        load_dotenv()
+        load_env()
         
         # Initialize configuration
         self.config = config or {}
         
         # Set up output directories
         self.output_dir = self.config.get("output_dir", "output")
-        os.makedirs(self.output_dir, exist_ok=True)
+        ensure_dir(self.output_dir)
         
         # Create subdirectories for each stage
         self.text_dir = os.path.join(self.output_dir, "text")
@@ -54,8 +82,9 @@ class YouTubeShortsCreator:
         self.video_dir = os.path.join(self.output_dir, "video")
         self.final_dir = os.path.join(self.output_dir, "final")
         
+        # Created once here; the clients' ensure_dir calls for these directories are then free
         for directory in [self.text_dir, self.audio_dir, self.music_dir, self.video_dir, self.final_dir]:
-            os.makedirs(directory, exist_ok=True)
+            ensure_dir(directory)
         
         # Initialize component modules
         self.text_generator = TextGenerator(
@@ -67,16 +96,157 @@ class YouTubeShortsCreator:
         )
         
         self.video_generator = VideoGenerator(
-            api_key=os.getenv("RUNWAY_API_KEY")
+            api_key=os.getenv("RUNWAY_API_KEY"),
+            hw_encoder=self.config.get("hw_encoder", "auto"),
+            x264_preset=self.config.get("x264_preset", "ultrafast")
         )
         
         self.music_generator = MusicGenerator(
             api_key=os.getenv("SUNO_API_KEY")
         )
         
+        # Share one on-disk cache of API results between the clients
+        self.api_cache = APICache(self.config.get("cache_dir", os.path.join(self.output_dir, ".cache")))
+        for client in [self.text_generator.client, self.audio_generator.client,
+                       self.video_generator.client, self.music_generator.client]:
+            client.api_cache = self.api_cache
+        
         logger.info("YouTube Shorts Creator pipeline initialized")
     
-    def create_short(self, topic, output_name=None, voice_id=None, duration=30, add_captions=True):
+    async def _generate_media(self, topic, script, paths, voice_id, duration, pool=None, music_pool=None,
+                              tts_client=None, submit_video=None):
+        """
+        Generate the voiceover, background music and video with as much overlap as possible.
+        
+        Music only needs the target duration, so Suno starts alongside the
+        voiceover. The video needs the actual voiceover length, so Runway starts
+        as soon as the voiceover is done and runs while Suno is still working.
+        The music is then fitted to the voiceover.
+        
+        Args:
+            topic (str): The topic or idea for the YouTube Short
+            script (str): The script to voice
+            paths (dict): Output paths of the Short, from _output_paths
+            voice_id (str): Voice ID for TTS, or None to auto-select
+            duration (int): Target duration in seconds
+            pool (RequestPool, optional): Pool shared by a batch of Shorts. Defaults to None.
+            music_pool (RequestPool, optional): Separate pool for the music request, so slow Suno polls
+                do not hold up voiceovers queued on pool. Defaults to None (use pool).
+            tts_client (AsyncElevenLabsClient, optional): Open voiceover client shared by a batch of Shorts.
+                Defaults to None.
+            submit_video (callable, optional): Coroutine function that takes the video job and returns
+                the video result. Batches use it to submit all their videos together. Defaults to None
+                (generate the video on its own).
+            
+        Returns:
+            tuple: The voiceover, music and video results
+        """
+        music_prompt = f"Background music for a YouTube Short about {topic}. Upbeat, energetic, and engaging."
+        
+        music_task = asyncio.create_task(self.music_generator.generate_background_music_async(
+            prompt=music_prompt,
+            output_path=paths["music"],
+            duration=duration,
+            mood="Background",  # Specify background mood for better results with voiceover
+            pool=music_pool or pool
+        ))
+        
+        video_task = None
+        try:
+            voiceover_result = await self.audio_generator.generate_voiceover_async(
+                script=script,
+                output_path=paths["voiceover"],
+                voice_id=voice_id,
+                pool=pool,
+                client=tts_client
+            )
+            voiceover_path = voiceover_result["output_path"]
+            voiceover_duration = await asyncio.to_thread(self.music_generator.get_audio_duration, voiceover_path)
+            
+            video_job = self._video_job(topic, paths, voiceover_duration)
+            if submit_video is None:
+                logger.info("Step 4: Generating video")
+                video_task = asyncio.create_task(self.video_generator.generate_video_from_text_async(**video_job))
+            else:
+                video_task = asyncio.create_task(submit_video(video_job))
+            
+            music_result = await music_task
+            music_result = await asyncio.to_thread(
+                self.music_generator.fit_music_to_voiceover,
+                music_result=music_result,
+                voiceover_path=voiceover_path,
+                voiceover_duration=voiceover_duration
+            )
+            video_result = await video_task
+        except BaseException:
+            # Cancel whatever is still running, so no task is left without anyone awaiting it
+            for task in (music_task, video_task):
+                if task is not None:
+                    task.cancel()
+            raise
+        
+        return voiceover_result, music_result, video_result
+    
+    def _video_job(self, topic, paths, duration):
+        """
+        Build the text-to-video request for a Short.
+        
+        Args:
+            topic (str): The topic or idea for the YouTube Short
+            paths (dict): Output paths of the Short, from _output_paths
+            duration (float): Video duration in seconds
+            
+        Returns:
+            dict: Keyword arguments for VideoGenerator.generate_video_from_text_async
+        """
+        return {
+            "prompt": f"A visually engaging YouTube Short about {topic}. Dynamic visuals with motion and energy.",
+            "output_path": paths["video"],
+            "duration": duration,
+            "preset": self.config.get("video_preset", "shorts_fast")
+        }
+    
+    async def _generate_script(self, topic, paths, duration):
+        """
+        Generate the script for a Short and save it, without blocking the event loop.
+        
+        Args:
+            topic (str): The topic or idea for the YouTube Short
+            paths (dict): Output paths of the Short, from _output_paths; the script is saved to paths["script"]
+            duration (int): Target duration in seconds
+            
+        Returns:
+            dict: The text generation result, with the script under "script"
+        """
+        def generate():
+            result = self.text_generator.generate_script(topic=topic, duration_seconds=duration)
+            with open(paths["script"], "w", encoding="utf-8") as f:
+                f.write(result["script"])
+            return result
+        
+        return await asyncio.to_thread(generate)
+    
+    def _output_paths(self, output_name):
+        """
+        Build the paths of every file a Short writes.
+        
+        Args:
+            output_name (str): Base name for output files
+            
+        Returns:
+            dict: Paths keyed by script, voiceover, music, video, video_with_audio, final_video and metadata
+        """
+        return {
+            "script": f"{self.text_dir}{os.sep}{output_name}_script.txt",
+            "voiceover": f"{self.audio_dir}{os.sep}{output_name}_voiceover.mp3",
+            "music": f"{self.music_dir}{os.sep}{output_name}_music.mp3",
+            "video": f"{self.video_dir}{os.sep}{output_name}_video.mp4",
+            "video_with_audio": f"{self.video_dir}{os.sep}{output_name}_with_audio.mp4",
+            "final_video": f"{self.final_dir}{os.sep}{output_name}.mp4",
+            "metadata": f"{self.final_dir}{os.sep}{output_name}_metadata.json"
+        }
+    
+    def create_short(self, topic, output_name=None, voice_id=None, duration=30, add_captions=True, cache=True):
         """
         Create a complete YouTube Short from a topic.
         
@@ -86,80 +256,211 @@ class YouTubeShortsCreator:
             voice_id (str, optional): Voice ID for TTS. Defaults to None (auto-select).
             duration (int, optional): Target duration in seconds. Defaults to 30.
             add_captions (bool, optional): Whether to add captions. Defaults to True.
+            cache (bool, optional): Whether to reuse cached API results for identical calls. Defaults to True.
+            
+        Returns:
+            dict: A dictionary containing paths to all generated files and metadata
+        """
+        return asyncio.run(self.create_short_async(
+            topic=topic,
+            output_name=output_name,
+            voice_id=voice_id,
+            duration=duration,
+            add_captions=add_captions,
+            cache=cache
+        ))
+    
+    def create_shorts(self, topics, voice_id=None, duration=30, add_captions=True, max_concurrency=4, cache=True):
+        """
+        Create several YouTube Shorts, running each stage across the whole batch.
+        
+        All scripts are generated concurrently, then the voiceover and music
+        requests are queued on one request pool per provider, so the minutes-long
+        Suno polls never hold up the quick ElevenLabs jobs. As soon as every voiceover
+        length is known, the videos are submitted to Runway in a single wave and
+        polled together from the event loop, without a thread per job, while Suno
+        is still working on the music. Finally the Shorts are rendered in
+        parallel, one ffmpeg pass per spare CPU core.
+        
+        Args:
+            topics (list): Topics or ideas, one per YouTube Short
+            voice_id (str, optional): Voice ID for TTS. Defaults to None (auto-select).
+            duration (int, optional): Target duration in seconds. Defaults to 30.
+            add_captions (bool, optional): Whether to add captions. Defaults to True.
+            max_concurrency (int, optional): Maximum number of API calls in flight. Defaults to 4.
+            cache (bool, optional): Whether to reuse cached API results for identical calls. Defaults to True.
+            
+        Returns:
+            list: Results in the same order as topics, each shaped like the create_short result
+        """
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        all_paths = [self._output_paths(f"short_{timestamp}_{i}") for i in range(1, len(topics) + 1)]
+        
+        async def run():
+            with caching(cache):
+                logger.info("Creating %d YouTube Shorts", len(topics))
+                
+                logger.info("Step 1: Generating scripts")
+                script_results = await _gather_or_cancel(*(
+                    self._generate_script(topic, paths, duration)
+                    for topic, paths in zip(topics, all_paths)
+                ))
+                
+                # Runway gets the videos in one wave once every voiceover length is known
+                video_jobs = {}
+                video_wave = asyncio.get_running_loop().create_future()
+                
+                async def submit_video(index, job):
+                    video_jobs[index] = job
+                    if len(video_jobs) == len(topics):
+                        logger.info("Step 4: Generating videos")
+                        try:
+                            video_wave.set_result(await self.video_generator.generate_videos_from_text_async(
+                                [video_jobs[i] for i in range(len(topics))]
+                            ))
+                        except Exception as e:
+                            video_wave.set_exception(e)
+                    # Shielded, so cancelling one Short does not cancel the wave for the others
+                    return (await asyncio.shield(video_wave))[index]
+                
+                logger.info("Steps 2-4: Generating voiceovers, background music and videos")
+                # One voiceover client for the whole batch, so its requests share a connection pool
+                tts_client = self.audio_generator.async_client(max_concurrency)
+                # Suno gets its own pool, so its slow polls never take every worker from the voiceovers
+                pool = RequestPool(max_concurrency)
+                music_pool = RequestPool(max_concurrency)
+                async with tts_client, pool, music_pool:
+                    media_results = await _gather_or_cancel(*(
+                        self._generate_media(
+                            topic=topic,
+                            script=script_result["script"],
+                            paths=paths,
+                            voice_id=voice_id,
+                            duration=duration,
+                            pool=pool,
+                            music_pool=music_pool,
+                            tts_client=tts_client,
+                            submit_video=functools.partial(submit_video, index)
+                        )
+                        for index, (topic, paths, script_result) in enumerate(zip(topics, all_paths, script_results))
+                    ))
+                
+                # The render passes are CPU-bound ffmpeg processes, so run one per spare core
+                render_slots = asyncio.Semaphore(max(1, (os.cpu_count() or 2) - 1))
+                
+                async def finish(*args):
+                    async with render_slots:
+                        return await self._finish_short(*args)
+                
+                logger.info("Steps 5-6: Rendering the Shorts")
+                return await _gather_or_cancel(*(
+                    finish(topic, paths, script_result, voiceover_result,
+                           music_result, video_result, add_captions)
+                    for topic, paths, script_result, (voiceover_result, music_result, video_result)
+                    in zip(topics, all_paths, script_results, media_results)
+                ))
+        
+        return asyncio.run(run())
+    
+    async def create_short_async(self, topic, output_name=None, voice_id=None, duration=30, add_captions=True, pool=None, cache=True):
+        """
+        Create a complete YouTube Short from a topic without blocking the event loop.
+        
+        Args:
+            topic (str): The topic or idea for the YouTube Short
+            output_name (str, optional): Base name for output files. Defaults to timestamp.
+            voice_id (str, optional): Voice ID for TTS. Defaults to None (auto-select).
+            duration (int, optional): Target duration in seconds. Defaults to 30.
+            add_captions (bool, optional): Whether to add captions. Defaults to True.
+            pool (RequestPool, optional): Pool to queue the voiceover and music requests on. Defaults to None.
+            cache (bool, optional): Whether to reuse cached API results for identical calls. Defaults to True.
             
         Returns:
             dict: A dictionary containing paths to all generated files and metadata
         """
         # Generate a timestamp-based output name if not provided
-        if not output_name:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_name = f"short_{timestamp}"
+        output_name = output_name or f"short_{time.strftime('%Y%m%d_%H%M%S')}"
         
-        logger.info(f"Creating YouTube Short on topic: {topic}")
-        logger.info(f"Output name: {output_name}")
+        logger.info("Creating YouTube Short on topic: %s", topic)
+        logger.info("Output name: %s", output_name)
+        paths = self._output_paths(output_name)
         
-        # Step 1: Generate script
-        logger.info("Step 1: Generating script")
-        script_result = self.text_generator.generate_short_script(
-            topic=topic,
-            target_duration=duration,
-            output_file=os.path.join(self.text_dir, f"{output_name}_script.txt")
-        )
-        script = script_result["text"]
-        script_path = script_result["output_path"]
-        
-        # Step 2: Generate voiceover
-        logger.info("Step 2: Generating voiceover")
-        voiceover_result = self.audio_generator.generate_speech(
-            text=script,
-            output_path=os.path.join(self.audio_dir, f"{output_name}_voiceover.mp3"),
-            voice_id=voice_id
-        )
-        voiceover_path = voiceover_result["output_path"]
-        actual_duration = voiceover_result["metadata"]["duration"]
+        with caching(cache):
+            # Step 1: Generate script
+            logger.info("Step 1: Generating script")
+            script_result = await self._generate_script(topic, paths, duration)
+            
+            # Steps 2-4: Generate voiceover, background music and video concurrently
+            logger.info("Steps 2-3: Generating voiceover and background music")
+            voiceover_result, music_result, video_result = await self._generate_media(
+                topic=topic,
+                script=script_result["script"],
+                paths=paths,
+                voice_id=voice_id,
+                duration=duration,
+                pool=pool
+            )
         
-        # Step 3: Generate background music
-        logger.info("Step 3: Generating background music")
-        music_prompt = f"Background music for a YouTube Short about {topic}. Upbeat, energetic, and engaging."
-        music_result = self.music_generator.create_music_for_voiceover(
-            prompt=music_prompt,
-            voiceover_path=voiceover_path,
-            output_path=os.path.join(self.music_dir, f"{output_name}_music.mp3")
-        )
-        music_path = music_result["output_path"]
+        return await self._finish_short(topic, paths, script_result, voiceover_result,
+                                        music_result, video_result, add_captions)
+    
+    async def _finish_short(self, topic, paths, script_result, voiceover_result,
+                            music_result, video_result, add_captions):
+        """
+        Combine the generated components into the final Short and write its metadata.
         
-        # Step 4: Generate video
-        logger.info("Step 4: Generating video")
-        video_prompt = f"A visually engaging YouTube Short about {topic}. Dynamic visuals with motion and energy."
-        video_result = self.video_generator.generate_video_from_text(
-            prompt=video_prompt,
-            output_path=os.path.join(self.video_dir, f"{output_name}_video.mp4"),
-            duration=actual_duration
-        )
+        Args:
+            topic (str): The topic or idea for the YouTube Short
+            paths (dict): Output paths of the Short, from _output_paths
+            script_result (dict): The text generation result
+            voiceover_result (dict): The voiceover generation result
+            music_result (dict): The fitted background music result
+            video_result (dict): The video generation result
+            add_captions (bool): Whether to add captions
+            
+        Returns:
+            dict: A dictionary containing paths to all generated files and metadata
+        """
+        script = script_result["script"]
+        script_path = paths["script"]
+        voiceover_path = voiceover_result["output_path"]
+        music_path = music_result["output_path"]
         video_path = video_result["output_path"]
+        actual_duration = music_result["metadata"]["voiceover_duration"]
         
         # Step 5: Add audio to video
         logger.info("Step 5: Adding audio to video")
-        video_with_audio_path = os.path.join(self.video_dir, f"{output_name}_with_audio.mp4")
-        self.video_generator.add_audio_to_video(
+        video_with_audio_path = paths["video_with_audio"]
+        await asyncio.to_thread(
+            self.video_generator.add_audio_to_video,
             video_path=video_path,
             audio_path=voiceover_path,
             output_path=video_with_audio_path
         )
         
         # Step 6: Add captions if requested
-        final_video_path = os.path.join(self.final_dir, f"{output_name}.mp4")
-        if add_captions:
+        final_video_path = paths["final_video"]
+        if add_captions and self.config.get("fast_captions", True):
+            # Timed subtitles burned in by ffmpeg, copying the audio instead of re-encoding it
+            logger.info("Step 6: Adding captions")
+            await asyncio.to_thread(
+                self.video_generator.add_subtitles,
+                video_path=video_with_audio_path,
+                text=script,
+                output_path=final_video_path,
+                duration=actual_duration
+            )
+        elif add_captions:
             logger.info("Step 6: Adding captions")
-            self.video_generator.add_text_overlay(
+            await asyncio.to_thread(
+                self.video_generator.add_text_overlay,
                 video_path=video_with_audio_path,
                 text=script,
                 output_path=final_video_path
             )
         else:
-            # Just copy the video with audio to the final path
-            import shutil
-            shutil.copy(video_with_audio_path, final_video_path)
+            # Just link the video with audio to the final path
+            await asyncio.to_thread(link_or_copy, video_with_audio_path, final_video_path)
         
         # Step 7: Create metadata file
         metadata = {
@@ -182,11 +483,11 @@ class YouTubeShortsCreator:
             }
         }
         
-        metadata_path = os.path.join(self.final_dir, f"{output_name}_metadata.json")
-        with open(metadata_path, "w") as f:
-            json.dump(metadata, f, indent=2)
+        metadata_path = paths["metadata"]
+        with open(metadata_path, "wb") as f:
+            f.write(dumps(metadata, indent=True))
         
-        logger.info(f"YouTube Short created successfully: {final_video_path}")
+        logger.info("YouTube Short created successfully: %s", final_video_path)
         
         return {
             "output_path": final_video_path,
@@ -204,6 +505,7 @@ def main():
     parser.add_argument("--duration", type=int, default=30, help="Target duration in seconds (default: 30)")
     parser.add_argument("--no-captions", action="store_true", help="Disable captions")
     parser.add_argument("--output-dir", default="output", help="Output directory (default: output)")
+    parser.add_argument("--no-cache", action="store_true", help="Call the APIs even if a cached result exists")
     
     args = parser.parse_args()
     
@@ -217,7 +519,8 @@ def main():
         output_name=args.output,
         voice_id=args.voice,
         duration=args.duration,
-        add_captions=not args.no_captions
+        add_captions=not args.no_captions,
+        cache=not args.no_cache
     )
     
     print(f"\nYouTube Short created successfully!")
@@ -0,0 +1,79 @@
+"""
+Request pool for the YouTube Shorts AI Pipeline.
+This module dispatches queued API calls to a fixed number of async workers so that
+batches of Shorts share one concurrency cap instead of running one call at a time.
+"""
+
+import asyncio
+
+class RequestPool:
+    """Bounded pool of async workers that run submitted API calls as soon as a worker is free."""
+
+    def __init__(self, max_concurrency=4):
+        """
+        Initialize the request pool.
+
+        Args:
+            max_concurrency (int, optional): Number of calls allowed in flight at once. Defaults to 4.
+        """
+        self.max_concurrency = max_concurrency
+        self._queue = None
+        self._workers = []
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def start(self):
+        """Start the worker tasks on the running event loop."""
+        if self._workers:
+            return
+        self._queue = asyncio.Queue()
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.max_concurrency)]
+
+    async def close(self):
+        """Wait for queued calls to finish and stop the workers."""
+        if not self._workers:
+            return
+        await self._queue.join()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def submit(self, func, *args, **kwargs):
+        """
+        Queue a call and wait for its result.
+
+        Args:
+            func (callable): Coroutine function to run
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            The value returned by func. Exceptions raised by func propagate to the caller.
+        """
+        if not self._workers:
+            raise RuntimeError("RequestPool must be started before submitting calls")
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((func, args, kwargs, future))
+        return await future
+
+    async def _worker(self):
+        """Pull calls off the queue and resolve their futures."""
+        while True:
+            func, args, kwargs, future = await self._queue.get()
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(result)
+            finally:
+                self._queue.task_done()
@@ -4,9 +4,9 @@ This module handles the interaction with Rytr's API to generate script content f
 """
 
 import os
-import requests
-import json
-from dotenv import load_dotenv
+from ..env_utils import load_env
+from ..http_utils import create_session, parse_json
+from ..api_cache import memoize_api
 
 class RytrClient:
     """Client for interacting with Rytr's API to generate text content."""
@@ -18,7 +18,7 @@ class RytrClient:
         Args:
             api_key (str, optional): Rytr API key. If not provided, will look for RYTR_API_KEY in environment variables.
         """
-        load_dotenv()
+        load_env()
         self.api_key = api_key or os.getenv("RYTR_API_KEY")
         if not self.api_key:
             raise ValueError("Rytr API key is required. Set it as RYTR_API_KEY environment variable or pass it to the constructor.")
@@ -28,6 +28,12 @@ class RytrClient:
             "Authentication": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
+        
+        # Pooled session: reuses connections across calls and retries transient errors
+        self.session = create_session()
+        
+        # Set by the pipeline to reuse results of identical calls; None disables caching
+        self.api_cache = None
     
     def get_languages(self):
         """
@@ -36,9 +42,9 @@ class RytrClient:
         Returns:
             list: Available languages
         """
-        response = requests.get(f"{self.base_url}/languages", headers=self.headers)
+        response = self.session.get(f"{self.base_url}/languages", headers=self.headers)
         response.raise_for_status()
-        return response.json().get("data", [])
+        return parse_json(response).get("data", [])
     
     def get_tones(self):
         """
@@ -47,9 +53,9 @@ class RytrClient:
         Returns:
             list: Available tones
         """
-        response = requests.get(f"{self.base_url}/tones", headers=self.headers)
+        response = self.session.get(f"{self.base_url}/tones", headers=self.headers)
         response.raise_for_status()
-        return response.json().get("data", [])
+        return parse_json(response).get("data", [])
     
     def get_use_cases(self):
         """
@@ -58,10 +64,11 @@ class RytrClient:
         Returns:
             list: Available use cases
         """
-        response = requests.get(f"{self.base_url}/use-cases", headers=self.headers)
+        response = self.session.get(f"{self.base_url}/use-cases", headers=self.headers)
         response.raise_for_status()
-        return response.json().get("data", [])
+        return parse_json(response).get("data", [])
     
+    @memoize_api
     def generate_content(self, prompt, use_case="social_media_post", tone="convincing", language="English", num_variants=1, creativity_level=3):
         """
         Generate content using Rytr API.
@@ -89,9 +96,9 @@ class RytrClient:
             "format": "text"
         }
         
-        response = requests.post(f"{self.base_url}/ryte", headers=self.headers, json=payload)
+        response = self.session.post(f"{self.base_url}/ryte", headers=self.headers, json=payload)
         response.raise_for_status()
-        return response.json()
+        return parse_json(response)
     
     def generate_youtube_shorts_script(self, topic, tone="engaging", language="English", duration_seconds=60):
         """
@@ -106,8 +113,8 @@ class RytrClient:
         Returns:
             str: Generated script for YouTube Shorts
         """
-        # Calculate approximate word count based on speaking rate (150 words per minute is average)
-        word_count = int((duration_seconds / 60) * 150)
+        # Calculate approximate word count based on speaking rate (150 words/minute = 2.5 words/second)
+        word_count = int(duration_seconds * 2.5)
         
         prompt = f"""
         Create a script for a YouTube Short about {topic}.
@@ -137,8 +144,9 @@ class RytrClient:
             )
         
         # Extract the generated content
-        if response and "data" in response:
-            return response["data"][0]["text"]
+        data = response.get("data") if response else None
+        if data:
+            return data[0]["text"]
         else:
             raise Exception("Failed to generate YouTube Shorts script")
 
@@ -3,8 +3,11 @@ Main module for text generation in the YouTube Shorts AI Pipeline.
 This module provides a simplified interface for generating YouTube Shorts scripts.
 """
 
+import re
 from .rytr_client import RytrClient
 
+_WORD_RE = re.compile(r"\S+")
+
 class TextGenerator:
     """Text generation component for YouTube Shorts pipeline."""
     
@@ -46,8 +49,8 @@ class TextGenerator:
         )
         
         # Calculate estimated duration (rough approximation)
-        word_count = len(script_text.split())
-        estimated_duration = (word_count / 150) * 60  # Based on average speaking rate of 150 words per minute
+        word_count = sum(1 for _ in _WORD_RE.finditer(script_text))
+        estimated_duration = word_count * 0.4  # 150 words/minute = 0.4 seconds/word
         
         return {
             "script": script_text,
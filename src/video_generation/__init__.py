@@ -3,6 +3,6 @@ __init__.py file for the video_generation module.
 This file makes the directory a Python package and exposes key classes.
 """
 
-from .video_generator import VideoGenerator
+from .video_generator import VideoGenerator, FPS, PRESETS
 
-__all__ = ['VideoGenerator']
+__all__ = ['VideoGenerator', 'FPS', 'PRESETS']
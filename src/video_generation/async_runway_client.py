@@ -0,0 +1,225 @@
+"""
+Async Runway API Client for video generation in the YouTube Shorts AI Pipeline.
+This module polls many Runway generations from one event loop instead of one blocked thread per video.
+"""
+
+import os
+import random
+import asyncio
+import aiohttp
+from ..env_utils import load_env
+from ..file_utils import ensure_dir
+from ..http_utils import loads, retry_after_s, RETRY_STATUSES
+from ..api_cache import memoize_api
+
+class AsyncRunwayClient:
+    """Async client for generating Runway videos concurrently."""
+
+    # Shares cache entries with RunwayClient, whose methods take the same arguments
+    cache_namespace = "RunwayClient"
+
+    def __init__(self, api_key=None, max_connections=8, api_cache=None):
+        """
+        Initialize the async Runway client.
+
+        Args:
+            api_key (str, optional): Runway API key. If not provided, will look for RUNWAY_API_KEY in environment variables.
+            max_connections (int, optional): Maximum number of open connections. Defaults to 8.
+            api_cache (APICache, optional): Cache for results of identical calls. Defaults to None.
+        """
+        load_env()
+        self.api_key = api_key or os.getenv("RUNWAY_API_KEY")
+        if not self.api_key:
+            raise ValueError("Runway API key is required. Set it as RUNWAY_API_KEY environment variable or pass it to the constructor.")
+
+        self.base_url = "https://api.runwayml.com/v1"
+        self.headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        # Multipart uploads let the HTTP library set Content-Type with the boundary
+        self._multipart_headers = {k: v for k, v in self.headers.items() if k.lower() != "content-type"}
+        self.max_connections = max_connections
+        self.api_cache = api_cache
+        self.session = None
+
+    async def __aenter__(self):
+        # Auth headers are passed per call so they are not sent to the video CDN
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.max_connections),
+            timeout=aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=60)
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.session.close()
+        self.session = None
+
+    async def _poll_generation(self, generation_id, deadline_s=300):
+        """
+        Poll a generation until it completes, backing off between checks.
+
+        Uses the same schedule as RunwayClient: 1 second growing by 1.5x up to
+        15 seconds, with +/-20% jitter, but sleeps without holding a thread.
+        A 429 or 5xx status is retried after any Retry-After the server sent.
+
+        Args:
+            generation_id (str): The ID of the generation to poll
+            deadline_s (float, optional): Maximum time to wait in seconds. Defaults to 300.
+
+        Returns:
+            dict: The status data of the completed generation
+        """
+        loop = asyncio.get_running_loop()
+        status_url = f"{self.base_url}/generations/{generation_id}"
+        deadline = loop.time() + deadline_s
+        attempt = 0
+
+        while True:
+            retry_after = 0
+            async with self.session.get(status_url, headers=self.headers) as status_response:
+                # Rate limits and server errors are transient: keep polling instead of failing the job
+                if status_response.status in RETRY_STATUSES:
+                    retry_after = retry_after_s(status_response.headers)
+                    status_data = {}
+                else:
+                    status_response.raise_for_status()
+                    status_data = loads(await status_response.read())
+
+            status = status_data.get("status")
+
+            if status == "completed":
+                return status_data
+
+            elif status == "failed":
+                error = status_data.get("error", "Unknown error")
+                raise ValueError(f"Runway generation failed: {error}")
+
+            # Wait before polling again, without sleeping past the deadline
+            delay = max(min(15, 1.0 * (1.5 ** attempt)) * random.uniform(0.8, 1.2), retry_after)
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            await asyncio.sleep(min(delay, remaining))
+            attempt += 1
+
+        raise TimeoutError("Runway generation timed out")
+
+    async def _start_generation(self, url, **kwargs):
+        """
+        Submit a generation request.
+
+        Args:
+            url (str): The generation endpoint
+            **kwargs: Body and headers for the POST request
+
+        Returns:
+            str: The ID of the started generation
+        """
+        kwargs.setdefault("headers", self.headers)
+        async with self.session.post(url, **kwargs) as response:
+            response.raise_for_status()
+            generation_id = loads(await response.read()).get("id")
+
+        if not generation_id:
+            raise ValueError("Failed to get generation ID from Runway API")
+
+        return generation_id
+
+    async def _download_completed(self, status_data, output_path):
+        """
+        Stream the video of a completed generation to disk.
+
+        Args:
+            status_data (dict): The status data of the completed generation
+            output_path (str): The path to save the video file to
+
+        Returns:
+            str: The path to the saved video file
+        """
+        output = status_data.get("output") or {}
+        video_url = output.get("video")
+        if not video_url:
+            raise ValueError("No video URL in completed generation")
+
+        ensure_dir(os.path.dirname(os.path.abspath(output_path)))
+
+        async with self.session.get(video_url) as video_response:
+            video_response.raise_for_status()
+            with open(output_path, "wb") as f:
+                async for chunk in video_response.content.iter_chunked(1024 * 1024):
+                    f.write(chunk)
+
+        return output_path
+
+    @memoize_api
+    async def generate_video_from_text(self, prompt, output_path, duration=5, num_frames=24, width=768, height=1344):
+        """
+        Generate a video from a text prompt using Runway's text-to-video API.
+
+        Args:
+            prompt (str): The text prompt describing the video
+            output_path (str): The path to save the video file to
+            duration (int, optional): Duration in seconds. Defaults to 5.
+            num_frames (int, optional): Number of frames to generate. Defaults to 24.
+            width (int, optional): Video width. Defaults to 768.
+            height (int, optional): Video height. Defaults to 1344 (9:16 aspect ratio for Shorts).
+
+        Returns:
+            str: The path to the saved video file
+        """
+        if self.session is None:
+            raise RuntimeError("AsyncRunwayClient must be used as an async context manager")
+
+        payload = {
+            "prompt": prompt,
+            "num_frames": num_frames,
+            "width": width,
+            "height": height
+        }
+
+        generation_id = await self._start_generation(f"{self.base_url}/text-to-video", json=payload)
+        status_data = await self._poll_generation(generation_id)
+        return await self._download_completed(status_data, output_path)
+
+    async def generate_video_from_image(self, image_path, prompt, output_path, duration=5, num_frames=24):
+        """
+        Generate a video from an image using Runway's image-to-video API.
+
+        Args:
+            image_path (str): Path to the input image
+            prompt (str): The text prompt describing the video
+            output_path (str): The path to save the video file to
+            duration (int, optional): Duration in seconds. Defaults to 5.
+            num_frames (int, optional): Number of frames to generate. Defaults to 24.
+
+        Returns:
+            str: The path to the saved video file
+        """
+        if self.session is None:
+            raise RuntimeError("AsyncRunwayClient must be used as an async context manager")
+
+        with open(image_path, "rb") as f:
+            image_data = f.read()
+
+        form = aiohttp.FormData()
+        form.add_field("image", image_data, filename=os.path.basename(image_path))
+        form.add_field("prompt", prompt)
+        form.add_field("num_frames", str(num_frames))
+
+        generation_id = await self._start_generation(f"{self.base_url}/image-to-video", data=form,
+                                                     headers=self._multipart_headers)
+        status_data = await self._poll_generation(generation_id)
+        return await self._download_completed(status_data, output_path)
+
+    async def generate_videos_from_text(self, jobs):
+        """
+        Generate several videos from text prompts concurrently.
+
+        Args:
+            jobs (list): Dicts with the keyword arguments accepted by generate_video_from_text
+
+        Returns:
+            list: The paths to the saved video files, in the same order as jobs
+        """
+        return await asyncio.gather(*(self.generate_video_from_text(**job) for job in jobs))
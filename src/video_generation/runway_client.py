@@ -4,10 +4,13 @@ This module handles the interaction with Runway's API to generate videos for You
 """
 
 import os
-import requests
-import json
 import time
-from dotenv import load_dotenv
+import random
+from concurrent.futures import ThreadPoolExecutor
+from ..env_utils import load_env
+from ..file_utils import ensure_dir
+from ..http_utils import create_session, parse_json, retry_after_s, RETRY_STATUSES
+from ..api_cache import memoize_api, lookup, store
 
 class RunwayClient:
     """Client for interacting with Runway's API to generate video content."""
@@ -19,7 +22,7 @@ class RunwayClient:
         Args:
             api_key (str, optional): Runway API key. If not provided, will look for RUNWAY_API_KEY in environment variables.
         """
-        load_dotenv()
+        load_env()
         self.api_key = api_key or os.getenv("RUNWAY_API_KEY")
         if not self.api_key:
             raise ValueError("Runway API key is required. Set it as RUNWAY_API_KEY environment variable or pass it to the constructor.")
@@ -29,7 +32,113 @@ class RunwayClient:
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
+        # Multipart uploads let the HTTP library set Content-Type with the boundary
+        self._multipart_headers = {k: v for k, v in self.headers.items() if k.lower() != "content-type"}
+        
+        # Pooled session: reuses connections across the submit, poll and download
+        # requests and retries transient errors
+        self.session = create_session()
+        
+        # Set by the pipeline to reuse results of identical calls; None disables caching
+        self.api_cache = None
     
+    def _poll_generation(self, generation_id, deadline_s=300):
+        """
+        Poll a generation until it completes, backing off between checks.
+        
+        Args:
+            generation_id (str): The ID of the generation to poll
+            deadline_s (float, optional): Maximum time to wait in seconds. Defaults to 300.
+            
+        Returns:
+            dict: The status data of the completed generation
+        """
+        return self._poll_generations([generation_id], deadline_s=deadline_s)[generation_id]
+    
+    def _poll_generations(self, generation_ids, deadline_s=300):
+        """
+        Poll several generations in one loop until they all complete.
+        
+        Every pending generation is checked once per round, then a single sleep
+        covers all of them. The delay grows from 1 second by 1.5x per round up
+        to 15 seconds, with +/-20% jitter so separate batches do not poll in lockstep.
+        A 429 or 5xx status leaves the generation pending and stretches the next
+        sleep to any Retry-After the server sent.
+        
+        Args:
+            generation_ids (list): The IDs of the generations to poll
+            deadline_s (float, optional): Maximum time to wait in seconds. Defaults to 300.
+            
+        Returns:
+            dict: The status data of each completed generation, keyed by generation ID
+        """
+        deadline = time.monotonic() + deadline_s
+        pending = list(dict.fromkeys(generation_ids))
+        completed = {}
+        attempt = 0
+        
+        while True:
+            still_pending = []
+            retry_after = 0
+            for generation_id in pending:
+                status_response = self.session.get(f"{self.base_url}/generations/{generation_id}", headers=self.headers)
+                
+                # Rate limits and server errors are transient: keep polling instead of failing the job
+                if status_response.status_code in RETRY_STATUSES:
+                    retry_after = max(retry_after, retry_after_s(status_response.headers))
+                    still_pending.append(generation_id)
+                    continue
+                status_response.raise_for_status()
+                
+                status_data = parse_json(status_response)
+                status = status_data.get("status")
+                
+                if status == "completed":
+                    completed[generation_id] = status_data
+                
+                elif status == "failed":
+                    error = status_data.get("error", "Unknown error")
+                    raise ValueError(f"Runway generation failed: {error}")
+                
+                else:
+                    still_pending.append(generation_id)
+            
+            pending = still_pending
+            if not pending:
+                return completed
+            
+            # Wait before polling again, without sleeping past the deadline
+            delay = max(min(15, 1.0 * (1.5 ** attempt)) * random.uniform(0.8, 1.2), retry_after)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(delay, remaining))
+            attempt += 1
+        
+        raise TimeoutError(f"Runway generation timed out ({len(pending)} still pending)")
+    
+    def _download_video(self, video_url, output_path):
+        """
+        Stream a generated video to disk in bounded chunks.
+        
+        Args:
+            video_url (str): URL of the generated video
+            output_path (str): The path to save the video file to
+            
+        Returns:
+            str: The path to the saved video file
+        """
+        ensure_dir(os.path.dirname(os.path.abspath(output_path)))
+        
+        with self.session.get(video_url, stream=True, timeout=60) as video_response:
+            video_response.raise_for_status()
+            with open(output_path, "wb") as f:
+                for chunk in video_response.iter_content(chunk_size=1024 * 1024):
+                    f.write(chunk)
+        
+        return output_path
+    
+    @memoize_api
     def generate_video_from_text(self, prompt, output_path, duration=5, num_frames=24, width=768, height=1344):
         """
         Generate a video from a text prompt using Runway's text-to-video API.
@@ -45,6 +154,79 @@ class RunwayClient:
         Returns:
             str: The path to the saved video file
         """
+        # Start the generation and wait for completion
+        generation_id = self._start_text_to_video(prompt, num_frames, width, height)
+        status_data = self._poll_generation(generation_id)
+        
+        return self._download_completed(status_data, output_path)
+    
+    def generate_videos_from_text(self, jobs):
+        """
+        Generate several videos from text prompts, polling all of them together.
+        
+        All generations are submitted up front so Runway renders them in
+        parallel, then one polling loop waits for the whole batch before the
+        videos are downloaded concurrently.
+        
+        Args:
+            jobs (list): Dicts with "prompt" and "output_path", and optionally
+                "duration", "num_frames", "width" and "height" as for generate_video_from_text
+            
+        Returns:
+            list: The paths to the saved video files, in the same order as jobs
+        """
+        if not jobs:
+            return []
+        
+        # Same arguments as generate_video_from_text, so both share cache entries
+        calls = [
+            {
+                "prompt": job["prompt"],
+                "output_path": job["output_path"],
+                "duration": job.get("duration", 5),
+                "num_frames": job.get("num_frames", 24),
+                "width": job.get("width", 768),
+                "height": job.get("height", 1344)
+            }
+            for job in jobs
+        ]
+        pending = [
+            call for call in calls
+            if not lookup(self.api_cache, RunwayClient.generate_video_from_text, self, **call)
+        ]
+        
+        generation_ids = [
+            self._start_text_to_video(call["prompt"], call["num_frames"], call["width"], call["height"])
+            for call in pending
+        ]
+        statuses = self._poll_generations(generation_ids)
+        
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(8, len(pending))) as executor:
+                list(executor.map(
+                    lambda generation_id, call: self._download_completed(statuses[generation_id], call["output_path"]),
+                    generation_ids,
+                    pending
+                ))
+        
+        for call in pending:
+            store(self.api_cache, RunwayClient.generate_video_from_text, self, **call)
+        
+        return [call["output_path"] for call in calls]
+    
+    def _start_text_to_video(self, prompt, num_frames, width, height):
+        """
+        Submit a text-to-video generation.
+        
+        Args:
+            prompt (str): The text prompt describing the video
+            num_frames (int): Number of frames to generate
+            width (int): Video width
+            height (int): Video height
+            
+        Returns:
+            str: The ID of the started generation
+        """
         url = f"{self.base_url}/text-to-video"
         
         payload = {
@@ -54,50 +236,33 @@ class RunwayClient:
             "height": height
         }
         
-        # Start the generation
-        response = requests.post(url, json=payload, headers=self.headers)
+        response = self.session.post(url, json=payload, headers=self.headers)
         response.raise_for_status()
         
         # Get the generation ID
-        generation_id = response.json().get("id")
+        generation_id = parse_json(response).get("id")
         if not generation_id:
             raise ValueError("Failed to get generation ID from Runway API")
         
-        # Poll for completion
-        status_url = f"{self.base_url}/generations/{generation_id}"
-        max_attempts = 60  # 5 minutes with 5-second intervals
+        return generation_id
+    
+    def _download_completed(self, status_data, output_path):
+        """
+        Download the video of a completed generation.
         
-        for attempt in range(max_attempts):
-            status_response = requests.get(status_url, headers=self.headers)
-            status_response.raise_for_status()
-            
-            status_data = status_response.json()
-            status = status_data.get("status")
-            
-            if status == "completed":
-                # Download the video
-                video_url = status_data.get("output", {}).get("video")
-                if not video_url:
-                    raise ValueError("No video URL in completed generation")
-                
-                video_response = requests.get(video_url)
-                video_response.raise_for_status()
-                
-                # Save the video
-                os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
-                with open(output_path, "wb") as f:
-                    f.write(video_response.content)
-                
-                return output_path
-            
-            elif status == "failed":
-                error = status_data.get("error", "Unknown error")
-                raise ValueError(f"Runway generation failed: {error}")
+        Args:
+            status_data (dict): The status data of the completed generation
+            output_path (str): The path to save the video file to
             
-            # Wait before polling again
-            time.sleep(5)
+        Returns:
+            str: The path to the saved video file
+        """
+        output = status_data.get("output") or {}
+        video_url = output.get("video")
+        if not video_url:
+            raise ValueError("No video URL in completed generation")
         
-        raise TimeoutError("Runway generation timed out")
+        return self._download_video(video_url, output_path)
     
     def generate_video_from_image(self, image_path, prompt, output_path, duration=5, num_frames=24):
         """
@@ -129,54 +294,19 @@ class RunwayClient:
             "num_frames": str(num_frames)
         }
         
-        # Remove Content-Type from headers for multipart request
-        headers = self.headers.copy()
-        headers.pop("Content-Type", None)
-        
         # Start the generation
-        response = requests.post(url, files=files, data=data, headers=headers)
+        response = self.session.post(url, files=files, data=data, headers=self._multipart_headers)
         response.raise_for_status()
         
         # Get the generation ID
-        generation_id = response.json().get("id")
+        generation_id = parse_json(response).get("id")
         if not generation_id:
             raise ValueError("Failed to get generation ID from Runway API")
         
-        # Poll for completion
-        status_url = f"{self.base_url}/generations/{generation_id}"
-        max_attempts = 60  # 5 minutes with 5-second intervals
-        
-        for attempt in range(max_attempts):
-            status_response = requests.get(status_url, headers=self.headers)
-            status_response.raise_for_status()
-            
-            status_data = status_response.json()
-            status = status_data.get("status")
-            
-            if status == "completed":
-                # Download the video
-                video_url = status_data.get("output", {}).get("video")
-                if not video_url:
-                    raise ValueError("No video URL in completed generation")
-                
-                video_response = requests.get(video_url)
-                video_response.raise_for_status()
-                
-                # Save the video
-                os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
-                with open(output_path, "wb") as f:
-                    f.write(video_response.content)
-                
-                return output_path
-            
-            elif status == "failed":
-                error = status_data.get("error", "Unknown error")
-                raise ValueError(f"Runway generation failed: {error}")
-            
-            # Wait before polling again
-            time.sleep(5)
+        # Wait for completion
+        status_data = self._poll_generation(generation_id)
         
-        raise TimeoutError("Runway generation timed out")
+        return self._download_completed(status_data, output_path)
 
 
 if __name__ == "__main__":
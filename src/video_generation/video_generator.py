@@ -4,23 +4,287 @@ This module provides a simplified interface for generating videos for YouTube Sh
 """
 
 import os
+import re
 import tempfile
-from moviepy.editor import VideoFileClip, AudioFileClip, CompositeVideoClip, TextClip
+import subprocess
+from functools import lru_cache
+from contextlib import ExitStack
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from ..file_utils import ensure_dir, link_or_copy, atomic_output
+from ..api_cache import APICache
 from .runway_client import RunwayClient
 
+# Default location of cached Runway videos for generators used outside the pipeline
+DEFAULT_VIDEO_CACHE_DIR = os.path.expanduser(os.path.join("~", ".cache", "ytshorts", "videos"))
+
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+
+# Frame rate Runway renders at natively
+FPS = 24
+
+# 9:16 output resolutions; shorts_fast is Runway's native resolution, so it is rendered without rescaling
+PRESETS = {
+    "shorts_fast": (720, 1280),
+    "shorts_hq": (768, 1344),
+}
+
+def _num_frames(duration):
+    """
+    Get the whole number of frames for a duration at FPS.
+    
+    Args:
+        duration (float): Duration in seconds, which may be fractional when measured from audio
+        
+    Returns:
+        int: The frame count
+    """
+    return int(round(duration * FPS))
+
+def _preset_dimensions(preset, width=None, height=None):
+    """
+    Resolve the output dimensions for a preset, with optional explicit overrides.
+    
+    Args:
+        preset (str): A key of PRESETS
+        width (int, optional): Width overriding the preset. Defaults to None.
+        height (int, optional): Height overriding the preset. Defaults to None.
+        
+    Returns:
+        tuple: The width and height
+    """
+    if preset not in PRESETS:
+        raise ValueError(f"Unknown video preset {preset!r}. Choose one of: {', '.join(PRESETS)}")
+    preset_width, preset_height = PRESETS[preset]
+    return width or preset_width, height or preset_height
+
+def _duration_s(path):
+    """
+    Get the duration of a media file from its container metadata.
+    
+    Args:
+        path (str): Path to the media file
+        
+    Returns:
+        float: Duration in seconds
+    """
+    output = subprocess.check_output(
+        ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", path]
+    )
+    return float(output)
+
+def _remux_faststart(src, dst):
+    """
+    Copy a video with its moov atom moved to the front, without re-encoding.
+    
+    Players can then start a progressive download before it completes.
+    Falls back to linking or copying the file as is if ffmpeg is not installed.
+    
+    Args:
+        src (str): Path to the input video
+        dst (str): Path to write the remuxed video to
+    """
+    try:
+        with atomic_output(dst) as tmp_path:
+            subprocess.run(
+                ["ffmpeg", "-y", "-v", "error", "-i", src, "-map", "0", "-c", "copy", "-movflags", "+faststart", tmp_path],
+                check=True
+            )
+    except FileNotFoundError:
+        link_or_copy(src, dst)
+
+# Audio already in these containers holds AAC and can be muxed into MP4 without re-encoding
+_AAC_EXTENSIONS = (".m4a", ".aac")
+
+def _prepare_audio(audio_path, output_path):
+    """
+    Encode an audio file to AAC ahead of muxing.
+    
+    Lets the later mux copy the audio stream instead of encoding it.
+    Falls back to the original file if ffmpeg is not installed or cannot read it.
+    
+    Args:
+        audio_path (str): Path to the audio file
+        output_path (str): Path to write the AAC file to, ending in .m4a
+        
+    Returns:
+        str: The path to the audio file to mux
+    """
+    if audio_path.lower().endswith(_AAC_EXTENSIONS):
+        return audio_path
+    try:
+        subprocess.run(
+            ["ffmpeg", "-y", "-v", "error", "-i", audio_path, "-vn", "-c:a", "aac", output_path],
+            check=True
+        )
+        return output_path
+    except (FileNotFoundError, subprocess.CalledProcessError):
+        return audio_path
+
+def _audio_codec_args(audio_path):
+    """Return the ffmpeg audio codec arguments for muxing audio_path into an MP4."""
+    return ["-c:a", "copy"] if audio_path.lower().endswith(_AAC_EXTENSIONS) else ["-c:a", "aac"]
+
+# Hardware H.264 encoders in order of preference, with their rate-control settings
+_HW_ENCODER_PARAMS = {
+    "h264_nvenc": ["-preset", "p4", "-b:v", "6M"],
+    "h264_qsv": ["-preset", "medium", "-b:v", "6M"],
+    "h264_videotoolbox": ["-b:v", "6M"],
+}
+
+@lru_cache(maxsize=None)
+def _detect_hw_encoder():
+    """
+    Find a hardware H.264 encoder that works on this machine, once per process.
+    
+    An encoder listed by ffmpeg may still lack a device or driver, so each
+    candidate is tried on a single blank frame before it is chosen.
+    
+    Returns:
+        str: The encoder name, or None if only software encoding is available
+    """
+    try:
+        encoders = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-encoders"], capture_output=True, text=True, check=True
+        ).stdout
+    except (FileNotFoundError, subprocess.CalledProcessError):
+        return None
+    
+    for encoder in _HW_ENCODER_PARAMS:
+        if encoder not in encoders:
+            continue
+        probe = subprocess.run(
+            ["ffmpeg", "-v", "error", "-f", "lavfi", "-i", "color=size=256x256:duration=0.1",
+             "-frames:v", "1", "-c:v", encoder, "-f", "null", "-"],
+            capture_output=True
+        )
+        if probe.returncode == 0:
+            return encoder
+    
+    return None
+
+# Bold caption fonts to try, in order; Pillow looks bare file names up in the system font directories
+_CAPTION_FONTS = ("Arial Bold.ttf", "arialbd.ttf", "DejaVuSans-Bold.ttf")
+
+# overlay filter coordinates for each caption position
+_OVERLAY_POSITIONS = {
+    "top": "(W-w)/2:50",
+    "center": "(W-w)/2:(H-h)/2",
+    "bottom": "(W-w)/2:H-h-50",
+}
+
+@lru_cache(maxsize=None)
+def _caption_font(font_size):
+    """Load the first available caption font at the given size."""
+    from PIL import ImageFont
+    
+    for font_name in _CAPTION_FONTS:
+        try:
+            return ImageFont.truetype(font_name, font_size)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+def _write_caption_png(text, png_path, font_size=40, color="white"):
+    """
+    Rasterize a caption once, as an RGBA image on a black box, for ffmpeg to overlay.
+    
+    Args:
+        text (str): Caption text, which may span several lines
+        png_path (str): Path to write the PNG to
+        font_size (int, optional): Font size. Defaults to 40.
+        color (str, optional): Text color. Defaults to "white".
+    """
+    from PIL import Image, ImageDraw
+    
+    font = _caption_font(font_size)
+    padding = font_size // 4
+    
+    bbox = ImageDraw.Draw(Image.new("RGBA", (1, 1))).multiline_textbbox((0, 0), text, font=font, align="center")
+    left, top, right, bottom = (round(value) for value in bbox)
+    image = Image.new("RGBA", (right - left + 2 * padding, bottom - top + 2 * padding), "black")
+    ImageDraw.Draw(image).multiline_text(
+        (padding - left, padding - top), text, font=font, fill=color, align="center"
+    )
+    image.save(png_path)
+
+def _srt_timestamp(seconds):
+    """Format seconds as an SRT timestamp (HH:MM:SS,mmm)."""
+    millis = int(round(seconds * 1000))
+    hours, millis = divmod(millis, 3600000)
+    minutes, millis = divmod(millis, 60000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
+
+def _write_srt(text, duration, srt_path):
+    """
+    Write an SRT file that shows the text one sentence at a time.
+    
+    Each sentence is on screen for a share of the duration proportional to its length,
+    which roughly follows the pace of the voiceover.
+    
+    Args:
+        text (str): The caption text
+        duration (float): Total duration to spread the sentences over, in seconds
+        srt_path (str): Path to write the SRT file to
+    """
+    sentences = [sentence for sentence in _SENTENCE_SPLIT_RE.split(text.strip()) if sentence]
+    total_chars = sum(len(sentence) for sentence in sentences) or 1
+    
+    entries = []
+    start = 0.0
+    for index, sentence in enumerate(sentences, 1):
+        end = start + duration * len(sentence) / total_chars
+        entries.append(f"{index}\n{_srt_timestamp(start)} --> {_srt_timestamp(end)}\n{sentence}\n")
+        start = end
+    
+    with open(srt_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(entries))
+
 class VideoGenerator:
     """Video generation component for YouTube Shorts pipeline."""
     
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, hw_encoder=None, cache_dir=DEFAULT_VIDEO_CACHE_DIR, x264_preset="ultrafast"):
         """
         Initialize the video generator.
         
         Args:
             api_key (str, optional): Runway API key. If not provided, will look for RUNWAY_API_KEY in environment variables.
+            hw_encoder (str, optional): H.264 encoder for re-encoded output: "h264_nvenc", "h264_qsv",
+                "h264_videotoolbox", or "auto" to pick a working one. Defaults to None (libx264 on the CPU).
+            cache_dir (str, optional): Directory to cache generated videos in, keyed by prompt, duration and
+                dimensions. Defaults to ~/.cache/ytshorts/videos; None disables the cache.
+            x264_preset (str, optional): libx264 preset for software encoding. Shorts are short-lived, so
+                speed is favored by default; use "fast" or "medium" for smaller files. Defaults to "ultrafast".
         """
         self.client = RunwayClient(api_key)
+        # Repeated prompts are served from disk instead of being rendered by Runway again
+        self.client.api_cache = APICache(cache_dir) if cache_dir else None
+        self.hw_encoder = hw_encoder
+        self.x264_preset = x264_preset
+    
+    def _video_encoder(self):
+        """
+        Resolve the H.264 encoder to use for re-encoded output.
+        
+        Returns:
+            tuple: The encoder name and its extra ffmpeg parameters. The encoder is None for libx264.
+        """
+        encoder = _detect_hw_encoder() if self.hw_encoder == "auto" else self.hw_encoder
+        return encoder, _HW_ENCODER_PARAMS.get(encoder, [])
     
-    def generate_video_from_text(self, prompt, output_path, duration=10, width=768, height=1344):
+    def _codec_args(self):
+        """
+        Build the ffmpeg video codec arguments for re-encoded output.
+        
+        Returns:
+            list: The hardware encoder and its parameters, or libx264 at x264_preset using every core
+        """
+        encoder, encoder_params = self._video_encoder()
+        if encoder:
+            return ["-c:v", encoder, *encoder_params]
+        return ["-c:v", "libx264", "-preset", self.x264_preset, "-crf", "23", "-threads", "0"]
+    
+    def generate_video_from_text(self, prompt, output_path, duration=10, preset="shorts_fast", width=None, height=None):
         """
         Generate a video from a text prompt.
         
@@ -28,14 +292,17 @@ class VideoGenerator:
             prompt (str): The text prompt describing the video
             output_path (str): The path to save the video file to
             duration (int, optional): Duration in seconds. Defaults to 10.
-            width (int, optional): Video width. Defaults to 768.
-            height (int, optional): Video height. Defaults to 1344 (9:16 aspect ratio for Shorts).
+            preset (str, optional): Output resolution from PRESETS. Defaults to "shorts_fast" (720x1280).
+            width (int, optional): Video width overriding the preset. Defaults to None.
+            height (int, optional): Video height overriding the preset. Defaults to None.
             
         Returns:
             dict: A dictionary containing the output path and metadata
         """
-        # Calculate frames based on duration (assuming 24fps)
-        num_frames = duration * 24
+        width, height = _preset_dimensions(preset, width, height)
+        
+        # Calculate frames based on duration
+        num_frames = _num_frames(duration)
         
         # Generate the video
         video_path = self.client.generate_video_from_text(
@@ -52,6 +319,7 @@ class VideoGenerator:
             "metadata": {
                 "prompt": prompt,
                 "duration": duration,
+                "preset": preset,
                 "width": width,
                 "height": height,
                 "num_frames": num_frames,
@@ -59,6 +327,107 @@ class VideoGenerator:
             }
         }
     
+    def generate_videos_from_text(self, jobs):
+        """
+        Generate several videos from text prompts as one Runway batch.
+        
+        Args:
+            jobs (list): Dicts with "prompt" and "output_path", and optionally
+                "duration", "preset", "width" and "height" as for generate_video_from_text
+        
+        Returns:
+            list: Result dicts shaped like the generate_video_from_text result, in the same order as jobs
+        """
+        calls, metadata = self._text_to_video_calls(jobs)
+        video_paths = self.client.generate_videos_from_text(calls)
+        
+        return [
+            {"output_path": video_path, "metadata": meta}
+            for video_path, meta in zip(video_paths, metadata)
+        ]
+    
+    async def generate_video_from_text_async(self, prompt, output_path, duration=10, preset="shorts_fast",
+                                             width=None, height=None):
+        """
+        Generate a video from a text prompt without blocking a thread while Runway renders.
+        
+        Args:
+            prompt (str): The text prompt describing the video
+            output_path (str): The path to save the video file to
+            duration (int, optional): Duration in seconds. Defaults to 10.
+            preset (str, optional): Output resolution from PRESETS. Defaults to "shorts_fast" (720x1280).
+            width (int, optional): Video width overriding the preset. Defaults to None.
+            height (int, optional): Video height overriding the preset. Defaults to None.
+            
+        Returns:
+            dict: A dictionary containing the output path and metadata
+        """
+        job = {"prompt": prompt, "output_path": output_path, "duration": duration, "preset": preset,
+               "width": width, "height": height}
+        return (await self.generate_videos_from_text_async([job]))[0]
+    
+    async def generate_videos_from_text_async(self, jobs, max_connections=8):
+        """
+        Generate several videos from text prompts, polling them all from the event loop.
+        
+        Args:
+            jobs (list): Dicts with "prompt" and "output_path", and optionally
+                "duration", "preset", "width" and "height" as for generate_video_from_text
+            max_connections (int, optional): Maximum number of open connections. Defaults to 8.
+        
+        Returns:
+            list: Result dicts shaped like the generate_video_from_text result, in the same order as jobs
+        """
+        from .async_runway_client import AsyncRunwayClient
+        
+        calls, metadata = self._text_to_video_calls(jobs)
+        async with AsyncRunwayClient(self.client.api_key, max_connections=max_connections,
+                                     api_cache=self.client.api_cache) as client:
+            video_paths = await client.generate_videos_from_text(calls)
+        
+        return [
+            {"output_path": video_path, "metadata": meta}
+            for video_path, meta in zip(video_paths, metadata)
+        ]
+    
+    def _text_to_video_calls(self, jobs):
+        """
+        Translate text-to-video jobs into Runway client calls and result metadata.
+        
+        Args:
+            jobs (list): Dicts with "prompt" and "output_path", and optionally "duration", "preset", "width" and "height"
+        
+        Returns:
+            tuple: The client call arguments and the metadata, one entry per job
+        """
+        calls = []
+        metadata = []
+        for job in jobs:
+            duration = job.get("duration", 10)
+            preset = job.get("preset", "shorts_fast")
+            width, height = _preset_dimensions(preset, job.get("width"), job.get("height"))
+            meta = {
+                "prompt": job["prompt"],
+                "duration": duration,
+                "preset": preset,
+                "width": width,
+                "height": height,
+                # Calculate frames based on duration
+                "num_frames": _num_frames(duration),
+                "generation_type": "text-to-video"
+            }
+            calls.append({
+                "prompt": meta["prompt"],
+                "output_path": job["output_path"],
+                "duration": duration,
+                "num_frames": meta["num_frames"],
+                "width": meta["width"],
+                "height": meta["height"]
+            })
+            metadata.append(meta)
+        
+        return calls, metadata
+    
     def generate_video_from_image(self, image_path, prompt, output_path, duration=10):
         """
         Generate a video from an image.
@@ -72,8 +441,8 @@ class VideoGenerator:
         Returns:
             dict: A dictionary containing the output path and metadata
         """
-        # Calculate frames based on duration (assuming 24fps)
-        num_frames = duration * 24
+        # Calculate frames based on duration
+        num_frames = _num_frames(duration)
         
         # Generate the video
         video_path = self.client.generate_video_from_image(
@@ -99,6 +468,10 @@ class VideoGenerator:
         """
         Add audio to a video.
         
+        The video stream is copied as is and only the audio is encoded, in a
+        single ffmpeg pass. Audio longer than the video is trimmed and shorter
+        audio is looped. Falls back to MoviePy if ffmpeg is not installed.
+        
         Args:
             video_path (str): Path to the input video
             audio_path (str): Path to the audio file
@@ -107,37 +480,43 @@ class VideoGenerator:
         Returns:
             str: The path to the saved video file
         """
-        # Load the video and audio
-        video_clip = VideoFileClip(video_path)
-        audio_clip = AudioFileClip(audio_path)
-        
-        # If audio is longer than video, trim it
-        if audio_clip.duration > video_clip.duration:
-            audio_clip = audio_clip.subclip(0, video_clip.duration)
-        
-        # If video is longer than audio, loop the audio
-        elif video_clip.duration > audio_clip.duration:
-            # Calculate how many times to loop
-            repeat_count = int(video_clip.duration / audio_clip.duration) + 1
-            # Create a new audio clip by concatenating the original multiple times
-            from moviepy.editor import concatenate_audioclips
-            audio_clip = concatenate_audioclips([audio_clip] * repeat_count)
-            # Trim to match video duration
-            audio_clip = audio_clip.subclip(0, video_clip.duration)
-        
-        # Set the audio
-        video_clip = video_clip.set_audio(audio_clip)
-        
-        # Write the result
-        video_clip.write_videofile(output_path, codec="libx264", audio_codec="aac")
-        
-        # Close the clips to release resources
-        video_clip.close()
-        audio_clip.close()
+        try:
+            video_duration = _duration_s(video_path)
+            with atomic_output(output_path) as tmp_path:
+                subprocess.run(
+                    [
+                        "ffmpeg", "-y", "-v", "error",
+                        "-i", video_path,
+                        "-stream_loop", "-1", "-i", audio_path,
+                        "-map", "0:v:0", "-map", "1:a:0",
+                        "-t", str(video_duration),
+                        "-c:v", "copy", *_audio_codec_args(audio_path),
+                        "-movflags", "+faststart",
+                        tmp_path
+                    ],
+                    check=True
+                )
+            return output_path
+        except FileNotFoundError:
+            # ffmpeg is not installed, fall back to MoviePy
+            return self._add_audio_to_video_moviepy(video_path, audio_path, output_path)
+    
+    def _add_audio_to_video_moviepy(self, video_path, audio_path, output_path):
+        """
+        Add audio to a video by re-encoding it with MoviePy.
         
-        return output_path
+        Args:
+            video_path (str): Path to the input video
+            audio_path (str): Path to the audio file
+            output_path (str): The path to save the combined video file to
+            
+        Returns:
+            str: The path to the saved video file
+        """
+        return self._render_short_moviepy(video_path, audio_path, None, output_path)
     
-    def add_text_overlay(self, video_path, text, output_path, font_size=40, color='white', position='bottom'):
+    def add_text_overlay(self, video_path, text, output_path, font_size=40, color='white', position='bottom',
+                         use_moviepy=False):
         """
         Add text overlay to a video.
         
@@ -148,12 +527,117 @@ class VideoGenerator:
             font_size (int, optional): Font size. Defaults to 40.
             color (str, optional): Text color. Defaults to 'white'.
             position (str, optional): Text position ('top', 'center', 'bottom'). Defaults to 'bottom'.
+            use_moviepy (bool, optional): Composite with MoviePy instead of ffmpeg. Defaults to False.
+            
+        Returns:
+            str: The path to the saved video file
+        """
+        if not use_moviepy:
+            codec_args = self._codec_args()
+            
+            with tempfile.TemporaryDirectory() as temp_dir:
+                # The caption is rasterized once and composited by ffmpeg instead of per frame in Python
+                caption_png = os.path.join(temp_dir, "caption.png")
+                _write_caption_png(text, caption_png, font_size, color)
+                position_expr = _OVERLAY_POSITIONS.get(position, _OVERLAY_POSITIONS["bottom"])
+                try:
+                    with atomic_output(output_path) as tmp_path:
+                        subprocess.run(
+                            [
+                                "ffmpeg", "-y", "-v", "error",
+                                "-i", video_path,
+                                "-i", caption_png,
+                                "-filter_complex", f"[0:v][1:v]overlay={position_expr}[v]",
+                                "-map", "[v]", "-map", "0:a?",
+                                *codec_args,
+                                "-r", str(FPS),
+                                "-c:a", "copy",
+                                tmp_path
+                            ],
+                            check=True
+                        )
+                    return output_path
+                except (FileNotFoundError, subprocess.CalledProcessError):
+                    # ffmpeg is not installed or failed, fall back to MoviePy
+                    pass
+        
+        return self._render_short_moviepy(video_path, None, text, output_path,
+                                          font_size=font_size, color=color, position=position)
+    
+    def _render_short_moviepy(self, video_path, audio_path, text, output_path, font_size=40, color='white',
+                              position='bottom'):
+        """
+        Attach audio and overlay text with MoviePy, opening the video once and encoding it once.
+        
+        Args:
+            video_path (str): Path to the input video
+            audio_path (str): Path to the audio file, or None to keep the video's own audio
+            text (str): Text to overlay, or None for no overlay
+            output_path (str): The path to save the video file to
+            font_size (int, optional): Font size. Defaults to 40.
+            color (str, optional): Text color. Defaults to 'white'.
+            position (str, optional): Text position ('top', 'center', 'bottom'). Defaults to 'bottom'.
             
         Returns:
             str: The path to the saved video file
         """
-        # Load the video
-        video_clip = VideoFileClip(video_path)
+        # MoviePy takes a few hundred milliseconds to import, so only the fallback paths pay for it
+        from moviepy.editor import VideoFileClip, AudioFileClip
+        
+        # Every clip is closed on the way out, even if a step fails, so no ffmpeg reader is left running
+        with ExitStack() as stack:
+            # Load the video
+            video_clip = stack.enter_context(VideoFileClip(video_path))
+            audio_clip = None
+            text_clip = None
+            if audio_path:
+                audio_clip = self._fitted_audio_clip(video_clip, stack.enter_context(AudioFileClip(audio_path)))
+            if text:
+                text_clip = stack.enter_context(self._text_clip(video_clip, text, font_size, color, position))
+            self._compose(video_clip, audio_clip, text_clip, output_path)
+        
+        return output_path
+    
+    def _fitted_audio_clip(self, video_clip, audio_clip):
+        """
+        Trim or loop audio to the length of a video.
+        
+        The returned clip reads from audio_clip, which the caller keeps open and closes.
+        
+        Args:
+            video_clip (VideoFileClip): The open video
+            audio_clip (AudioFileClip): The open audio
+            
+        Returns:
+            AudioClip: The audio, exactly as long as the video
+        """
+        from moviepy.audio.fx.audio_loop import audio_loop
+        
+        # If audio is longer than video, trim it
+        if audio_clip.duration > video_clip.duration:
+            audio_clip = audio_clip.subclip(0, video_clip.duration)
+        
+        # If video is longer than audio, loop the audio up to the video duration
+        elif video_clip.duration > audio_clip.duration:
+            audio_clip = audio_loop(audio_clip, duration=video_clip.duration)
+        
+        return audio_clip
+    
+    def _text_clip(self, video_clip, text, font_size, color, position):
+        """
+        Build a text clip positioned over a video for its whole duration.
+        
+        Args:
+            video_clip (VideoFileClip): The open video
+            text (str): Text to overlay
+            font_size (int): Font size
+            color (str): Text color
+            position (str): Text position ('top', 'center', 'bottom')
+            
+        Returns:
+            TextClip: The positioned text clip
+        """
+        from moviepy.editor import TextClip
         
         # Create the text clip
         text_clip = TextClip(text, fontsize=font_size, color=color, bg_color='black', 
@@ -168,21 +652,134 @@ class VideoGenerator:
             text_clip = text_clip.set_position(('center', video_clip.h - text_clip.h - 50))
         
         # Set the duration to match the video
-        text_clip = text_clip.set_duration(video_clip.duration)
+        return text_clip.set_duration(video_clip.duration)
+    
+    def _compose(self, video_clip, audio_clip, text_clip, out):
+        """
+        Layer already-open clips and encode the result once.
+        
+        Args:
+            video_clip (VideoFileClip): The open video
+            audio_clip (AudioClip): Audio to set on the video, or None to keep its own
+            text_clip (TextClip): Text to composite over the video, or None
+            out (str): The path to save the video file to
+        """
+        from moviepy.editor import CompositeVideoClip
         
-        # Composite the clips
-        final_clip = CompositeVideoClip([video_clip, text_clip])
+        if audio_clip is not None:
+            video_clip = video_clip.set_audio(audio_clip)
         
-        # Write the result
-        final_clip.write_videofile(output_path, codec="libx264", audio_codec="aac")
+        with ExitStack() as stack:
+            final_clip = video_clip
+            if text_clip is not None:
+                final_clip = stack.enter_context(CompositeVideoClip([video_clip, text_clip]))
+            
+            # Write the result
+            encoder, encoder_params = self._video_encoder()
+            if encoder:
+                codec_kwargs = {"codec": encoder, "ffmpeg_params": encoder_params}
+            else:
+                codec_kwargs = {"codec": "libx264", "preset": self.x264_preset, "ffmpeg_params": ["-crf", "23"]}
+            with atomic_output(out) as tmp_path:
+                final_clip.write_videofile(tmp_path, audio_codec="aac", threads=os.cpu_count(), **codec_kwargs)
+    
+    def add_subtitles(self, video_path, text, output_path, duration, font_size=16):
+        """
+        Burn timed captions into a video with a single ffmpeg pass.
+        
+        The text is split into sentences spread over the duration and rendered
+        through ffmpeg's subtitles filter. Only the video stream is re-encoded;
+        the audio is copied as is. Falls back to add_text_overlay if ffmpeg, or
+        its subtitles filter, is not available.
+        
+        Args:
+            video_path (str): Path to the input video
+            text (str): Caption text
+            output_path (str): The path to save the video file to
+            duration (float): Duration to spread the captions over, in seconds
+            font_size (int, optional): Subtitle font size, in libass units. Defaults to 16.
+            
+        Returns:
+            str: The path to the saved video file
+        """
+        codec_args = self._codec_args()
         
-        # Close the clips to release resources
-        video_clip.close()
-        text_clip.close()
-        final_clip.close()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            _write_srt(text, duration, os.path.join(temp_dir, "captions.srt"))
+            
+            # Run from the SRT's directory so its path needs no filtergraph escaping
+            try:
+                with atomic_output(output_path) as tmp_path:
+                    subprocess.run(
+                        [
+                            "ffmpeg", "-y", "-v", "error",
+                            "-i", os.path.abspath(video_path),
+                            "-vf", f"subtitles=captions.srt:force_style='Fontsize={font_size},Alignment=2'",
+                            *codec_args,
+                            "-c:a", "copy",
+                            tmp_path
+                        ],
+                        check=True,
+                        cwd=temp_dir
+                    )
+            except (FileNotFoundError, subprocess.CalledProcessError):
+                return self.add_text_overlay(video_path=video_path, text=text, output_path=output_path)
         
         return output_path
     
+    def _render_short_oneshot(self, base_video, audio, caption_text, out, font_size=40):
+        """
+        Attach audio and burn in a caption with a single ffmpeg pass.
+        
+        The caption is overlaid in the same filtergraph that maps the audio,
+        so each frame is decoded and encoded only once. Audio is looped or
+        trimmed to the video length as in add_audio_to_video.
+        
+        Args:
+            base_video (str): Path to the input video
+            audio (str): Path to the audio file, or None to keep the video's own audio
+            caption_text (str): Caption text to overlay at the bottom of the video
+            out (str): The path to save the video file to
+            font_size (int, optional): Font size. Defaults to 40.
+            
+        Returns:
+            str: The path to the saved video file
+        """
+        codec_args = self._codec_args()
+        
+        if audio:
+            audio_input = ["-stream_loop", "-1", "-i", audio]
+            audio_args = ["-map", "1:a:0", "-t", str(_duration_s(base_video)), *_audio_codec_args(audio)]
+        else:
+            audio_input = []
+            audio_args = ["-map", "0:a?", "-c:a", "copy"]
+        # The caption image is the last input
+        caption_input = 2 if audio else 1
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            caption_png = os.path.join(temp_dir, "caption.png")
+            _write_caption_png(caption_text, caption_png, font_size)
+            
+            with atomic_output(out) as tmp_path:
+                subprocess.run(
+                    [
+                        "ffmpeg", "-y", "-v", "error",
+                        "-i", base_video,
+                        *audio_input,
+                        "-i", caption_png,
+                        "-filter_complex", f"[0:v][{caption_input}:v]overlay={_OVERLAY_POSITIONS['bottom']}[v]",
+                        "-map", "[v]",
+                        *audio_args,
+                        *codec_args,
+                        "-r", str(FPS),
+                        "-movflags", "+faststart",
+                        tmp_path
+                    ],
+                    check=True
+                )
+        
+        return out
+    
     def create_youtube_short(self, prompt, audio_path=None, output_path=None, add_captions=False, caption_text=None):
         """
         Create a complete YouTube Short with optional audio and captions.
@@ -200,39 +797,138 @@ class VideoGenerator:
         # Create temporary directory for intermediate files
         temp_dir = tempfile.mkdtemp()
         
-        # Generate base video
+        # Generate base video, preparing the audio while Runway renders
         base_video_path = os.path.join(temp_dir, "base_video.mp4")
-        video_result = self.generate_video_from_text(
-            prompt=prompt,
-            output_path=base_video_path,
-            duration=10  # Default duration for Shorts
-        )
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            video_future = executor.submit(
+                self.generate_video_from_text,
+                prompt=prompt,
+                output_path=base_video_path,
+                duration=10  # Default duration for Shorts
+            )
+            audio_future = (
+                executor.submit(_prepare_audio, audio_path, os.path.join(temp_dir, "audio.m4a"))
+                if audio_path else None
+            )
+            video_result = video_future.result()
+            mux_audio_path = audio_future.result() if audio_future else None
         
-        current_video_path = base_video_path
+        return self._finish_short(prompt, base_video_path, mux_audio_path, temp_dir, output_path,
+                                  add_captions, caption_text)
+    
+    def create_shorts_batch(self, specs, max_workers=8):
+        """
+        Create several YouTube Shorts, rendering their base videos as one Runway batch.
+        
+        All generations are submitted and polled together over the client's
+        pooled session, while the audio for each Short is prepared in the
+        background. Each Short is then finished on a worker thread. This is
+        a generator: nothing runs until it is iterated.
+        
+        Args:
+            specs (list): Dicts with "prompt" and optionally "audio_path", "output_path",
+                "add_captions" and "caption_text" as for create_youtube_short
+            max_workers (int, optional): Maximum number of Shorts prepared and finished at once. Defaults to 8.
         
-        # Add audio if provided
-        if audio_path:
-            audio_video_path = os.path.join(temp_dir, "audio_video.mp4")
-            current_video_path = self.add_audio_to_video(
-                video_path=current_video_path,
-                audio_path=audio_path,
-                output_path=audio_video_path
+        Yields:
+            tuple: The index of the spec and its result dict, shaped like the
+                create_youtube_short result, as each Short finishes
+        """
+        temp_dirs = [tempfile.mkdtemp() for _ in specs]
+        base_video_paths = [os.path.join(temp_dir, "base_video.mp4") for temp_dir in temp_dirs]
+        
+        def finish(index, audio_future):
+            spec = specs[index]
+            mux_audio_path = audio_future.result() if audio_future else None
+            return index, self._finish_short(
+                spec["prompt"], base_video_paths[index], mux_audio_path, temp_dirs[index],
+                spec.get("output_path"), spec.get("add_captions", False), spec.get("caption_text")
             )
         
-        # Add captions if requested
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            audio_futures = [
+                executor.submit(_prepare_audio, spec["audio_path"], os.path.join(temp_dir, "audio.m4a"))
+                if spec.get("audio_path") else None
+                for spec, temp_dir in zip(specs, temp_dirs)
+            ]
+            
+            self.generate_videos_from_text([
+                # Default duration for Shorts
+                {"prompt": spec["prompt"], "output_path": base_video_path, "duration": 10}
+                for spec, base_video_path in zip(specs, base_video_paths)
+            ])
+            
+            futures = [executor.submit(finish, index, audio_future) for index, audio_future in enumerate(audio_futures)]
+            for future in as_completed(futures):
+                yield future.result()
+    
+    def _finish_short(self, prompt, base_video_path, mux_audio_path, temp_dir, output_path, add_captions, caption_text):
+        """
+        Attach the audio and captions to a generated base video.
+        
+        Args:
+            prompt (str): The text prompt the video was generated from
+            base_video_path (str): Path to the generated base video
+            mux_audio_path (str): Path to the prepared audio, or None for no audio
+            temp_dir (str): Directory for intermediate files
+            output_path (str): The path to save the final video, or None to keep it in temp_dir
+            add_captions (bool): Whether to add captions
+            caption_text (str): Text for captions
+            
+        Returns:
+            dict: A dictionary containing the output path and metadata
+        """
+        current_video_path = base_video_path
+        
+        # Attach the audio and burn in the captions with a single encode
         if add_captions and caption_text:
-            caption_video_path = os.path.join(temp_dir, "caption_video.mp4")
-            current_video_path = self.add_text_overlay(
-                video_path=current_video_path,
-                text=caption_text,
-                output_path=caption_video_path
-            )
+            # The fused pass already moves the moov atom up front, so it can write the final file directly
+            if output_path:
+                ensure_dir(os.path.dirname(os.path.abspath(output_path)))
+                oneshot_video_path = output_path
+            else:
+                oneshot_video_path = os.path.join(temp_dir, "short_video.mp4")
+            try:
+                current_video_path = self._render_short_oneshot(
+                    base_video=current_video_path,
+                    audio=mux_audio_path,
+                    caption_text=caption_text,
+                    out=oneshot_video_path
+                )
+            except (FileNotFoundError, subprocess.CalledProcessError):
+                # ffmpeg is not installed or failed, use MoviePy below
+                pass
+        
+        if current_video_path == base_video_path:
+            # Add captions, and audio if provided, in one MoviePy encode
+            if add_captions and caption_text:
+                caption_video_path = os.path.join(temp_dir, "caption_video.mp4")
+                current_video_path = self._render_short_moviepy(
+                    video_path=current_video_path,
+                    audio_path=mux_audio_path,
+                    text=caption_text,
+                    output_path=caption_video_path
+                )
+            
+            # Add audio if provided
+            elif mux_audio_path:
+                # The ffmpeg mux also moves the moov atom up front, so it can write the final file directly
+                if output_path:
+                    ensure_dir(os.path.dirname(os.path.abspath(output_path)))
+                    audio_video_path = output_path
+                else:
+                    audio_video_path = os.path.join(temp_dir, "audio_video.mp4")
+                current_video_path = self.add_audio_to_video(
+                    video_path=current_video_path,
+                    audio_path=mux_audio_path,
+                    output_path=audio_video_path
+                )
         
         # Move to final output path if provided
         if output_path:
-            import shutil
-            os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
-            shutil.copy(current_video_path, output_path)
+            if current_video_path != output_path:
+                ensure_dir(os.path.dirname(os.path.abspath(output_path)))
+                _remux_faststart(current_video_path, output_path)
             final_path = output_path
         else:
             final_path = current_video_path
@@ -241,7 +937,7 @@ class VideoGenerator:
             "output_path": final_path,
             "metadata": {
                 "prompt": prompt,
-                "has_audio": audio_path is not None,
+                "has_audio": mux_audio_path is not None,
                 "has_captions": add_captions and caption_text is not None,
                 "temp_dir": temp_dir
             }
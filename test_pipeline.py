@@ -5,119 +5,129 @@ This script tests each component individually and then the complete pipeline.
 
 import os
 import logging
-from dotenv import load_dotenv
-
-# Import all component modules
-from src.text_generation import TextGenerator
-from src.audio_generation import AudioGenerator
-from src.video_generation import VideoGenerator
-from src.music_generation import MusicGenerator
-from src.pipeline_integration import YouTubeShortsCreator
+import argparse
+import importlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from logging.handlers import MemoryHandler
+from src.env_utils import load_env
+from src.file_utils import ensure_dir
 
 # Configure logging
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Records for the log file are buffered in memory and written in batches, when the
+# buffer fills, on an error, or at the end of main(); the console still shows each line live
+log_file_handler = logging.FileHandler("test_pipeline.log", delay=True, encoding="utf-8")
+log_file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+log_buffer = MemoryHandler(capacity=1024, flushLevel=logging.ERROR, target=log_file_handler)
+
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    format=LOG_FORMAT,
     handlers=[
-        logging.FileHandler("test_pipeline.log"),
+        log_buffer,
         logging.StreamHandler()
     ]
 )
 logger = logging.getLogger("test_pipeline")
 
-def test_text_generation():
-    """Test the text generation module."""
-    logger.info("Testing text generation module...")
+# Component tests: display name, module and class of the generator, method to call,
+# its arguments, and a function describing the result for the log
+COMPONENT_TESTS = {
+    "text": (
+        "Text Generation", "src.text_generation", "TextGenerator", "generate_script",
+        {
+            "topic": "The future of AI in content creation",
+            "duration_seconds": 30
+        },
+        lambda result: f"Generated text: {result['script'][:100]}..."
+    ),
+    "audio": (
+        "Audio Generation", "src.audio_generation", "AudioGenerator", "generate_voiceover",
+        {
+            "script": "This is a test of the audio generation module for YouTube Shorts. The goal is to create engaging voiceovers for short videos.",
+            "output_path": "test_output/audio/test_speech.mp3"
+        },
+        lambda result: f"Voice: {result['metadata']['voice_name']}, {result['metadata']['word_count']} words"
+    ),
+    "video": (
+        "Video Generation", "src.video_generation", "VideoGenerator", "generate_video_from_text",
+        {
+            "prompt": "A person explaining AI tools for content creation, with animated graphics showing different tools",
+            "output_path": "test_output/video/test_video.mp4",
+            "duration": 10
+        },
+        None
+    ),
+    "music": (
+        "Music Generation", "src.music_generation", "MusicGenerator", "generate_background_music",
+        {
+            "prompt": "Upbeat and energetic background music for a YouTube Short about AI tools",
+            "output_path": "test_output/music/test_music.mp3",
+            "duration": 30,
+            "genre": "Electronic",
+            "mood": "Energetic"
+        },
+        lambda result: f"Music duration: {result['metadata']['actual_duration']} seconds"
+    )
+}
+
+def run_component_test(name, module, factory, method, kwargs, describe=None):
+    """
+    Run one component test: create the generator, call the method and log the result.
     
-    try:
-        # Initialize the text generator
-        text_generator = TextGenerator()
+    The generator's module is imported here, so a run of one test only loads what it uses.
+    
+    Args:
+        name (str): Display name of the component
+        module (str): Module the generator class is imported from
+        factory (str): Name of the generator class
+        method (str): Name of the generator method to call
+        kwargs (dict): Keyword arguments for the method
+        describe (callable, optional): Returns an extra log line for the result. Defaults to None.
         
-        # Generate a script
-        result = text_generator.generate_short_script(
-            topic="The future of AI in content creation",
-            target_duration=30,
-            output_file="test_output/text/test_script.txt"
-        )
+    Returns:
+        bool: Whether the test passed
+    """
+    logger.info(f"Testing {name.lower()} module...")
+    
+    try:
+        generator = getattr(importlib.import_module(module), factory)()
+        result = getattr(generator, method)(**kwargs)
         
-        logger.info(f"Text generation successful. Output: {result['output_path']}")
-        logger.info(f"Generated text: {result['text'][:100]}...")
+        # The text generator returns the script itself rather than writing a file
+        output_path = result.get("output_path")
+        logger.info(f"{name} successful." + (f" Output: {output_path}" if output_path else ""))
+        if describe:
+            logger.info(describe(result))
         return True
     except Exception as e:
-        logger.error(f"Text generation test failed: {e}")
+        logger.error(f"{name} test failed: {e}")
         return False
 
+def test_text_generation():
+    """Test the text generation module."""
+    return run_component_test(*COMPONENT_TESTS["text"])
+
 def test_audio_generation():
     """Test the audio generation module."""
-    logger.info("Testing audio generation module...")
-    
-    try:
-        # Initialize the audio generator
-        audio_generator = AudioGenerator()
-        
-        # Generate speech
-        result = audio_generator.generate_speech(
-            text="This is a test of the audio generation module for YouTube Shorts. The goal is to create engaging voiceovers for short videos.",
-            output_path="test_output/audio/test_speech.mp3"
-        )
-        
-        logger.info(f"Audio generation successful. Output: {result['output_path']}")
-        logger.info(f"Audio duration: {result['metadata']['duration']} seconds")
-        return True
-    except Exception as e:
-        logger.error(f"Audio generation test failed: {e}")
-        return False
+    return run_component_test(*COMPONENT_TESTS["audio"])
 
 def test_video_generation():
     """Test the video generation module."""
-    logger.info("Testing video generation module...")
-    
-    try:
-        # Initialize the video generator
-        video_generator = VideoGenerator()
-        
-        # Generate a video
-        result = video_generator.generate_video_from_text(
-            prompt="A person explaining AI tools for content creation, with animated graphics showing different tools",
-            output_path="test_output/video/test_video.mp4",
-            duration=10
-        )
-        
-        logger.info(f"Video generation successful. Output: {result['output_path']}")
-        return True
-    except Exception as e:
-        logger.error(f"Video generation test failed: {e}")
-        return False
+    return run_component_test(*COMPONENT_TESTS["video"])
 
 def test_music_generation():
     """Test the music generation module."""
-    logger.info("Testing music generation module...")
-    
-    try:
-        # Initialize the music generator
-        music_generator = MusicGenerator()
-        
-        # Generate background music
-        result = music_generator.generate_background_music(
-            prompt="Upbeat and energetic background music for a YouTube Short about AI tools",
-            output_path="test_output/music/test_music.mp3",
-            duration=30,
-            genre="Electronic",
-            mood="Energetic"
-        )
-        
-        logger.info(f"Music generation successful. Output: {result['output_path']}")
-        logger.info(f"Music duration: {result['metadata']['actual_duration']} seconds")
-        return True
-    except Exception as e:
-        logger.error(f"Music generation test failed: {e}")
-        return False
+    return run_component_test(*COMPONENT_TESTS["music"])
 
 def test_complete_pipeline():
     """Test the complete pipeline."""
     logger.info("Testing complete YouTube Shorts pipeline...")
     
     try:
+        from src.pipeline_integration import YouTubeShortsCreator
+        
         # Initialize the pipeline
         creator = YouTubeShortsCreator({
             "output_dir": "test_output"
@@ -138,43 +148,66 @@ def test_complete_pipeline():
         logger.error(f"Complete pipeline test failed: {e}")
         return False
 
-def main():
+def main(argv=None):
     """Run all tests."""
-    # Load environment variables
-    load_dotenv()
-    
-    # Create test output directory
-    os.makedirs("test_output", exist_ok=True)
-    os.makedirs("test_output/text", exist_ok=True)
-    os.makedirs("test_output/audio", exist_ok=True)
-    os.makedirs("test_output/video", exist_ok=True)
-    os.makedirs("test_output/music", exist_ok=True)
-    
-    # Run individual component tests
-    text_result = test_text_generation()
-    audio_result = test_audio_generation()
-    video_result = test_video_generation()
-    music_result = test_music_generation()
+    parser = argparse.ArgumentParser(description="Test the YouTube Shorts AI Pipeline")
+    parser.add_argument("--run-all", action="store_true",
+                        help="Run every component test, concurrently, instead of one at a time up to the first failure")
+    parser.add_argument("--only", action="append", choices=list(COMPONENT_TESTS),
+                        help="Run only this component test; may be repeated. Skips the complete pipeline test.")
+    args = parser.parse_args(argv)
     
-    # Run complete pipeline test if all component tests pass
-    if text_result and audio_result and video_result and music_result:
-        pipeline_result = test_complete_pipeline()
-    else:
-        logger.warning("Skipping complete pipeline test due to component test failures")
-        pipeline_result = False
-    
-    # Print summary
-    logger.info("\n--- Test Summary ---")
-    logger.info(f"Text Generation: {'PASS' if text_result else 'FAIL'}")
-    logger.info(f"Audio Generation: {'PASS' if audio_result else 'FAIL'}")
-    logger.info(f"Video Generation: {'PASS' if video_result else 'FAIL'}")
-    logger.info(f"Music Generation: {'PASS' if music_result else 'FAIL'}")
-    logger.info(f"Complete Pipeline: {'PASS' if pipeline_result else 'FAIL'}")
-    
-    if text_result and audio_result and video_result and music_result and pipeline_result:
-        logger.info("All tests passed successfully!")
-    else:
-        logger.warning("Some tests failed. Check the log for details.")
+    try:
+        # Load environment variables the same way the pipeline does
+        load_env()
+        
+        # Create test output directories; each one also creates test_output itself
+        for component in COMPONENT_TESTS:
+            ensure_dir(os.path.join("test_output", component))
+        
+        components = [spec for key, spec in COMPONENT_TESTS.items() if not args.only or key in args.only]
+        # None marks a test that did not run
+        results = {spec[0]: None for spec in components}
+        
+        if args.run_all:
+            # Run individual component tests concurrently, since each one mostly waits on a different API
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                futures = {executor.submit(run_component_test, *spec): spec[0] for spec in components}
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+        else:
+            # Run them one at a time, so the first failure really stops the rest
+            for spec in components:
+                results[spec[0]] = run_component_test(*spec)
+                if not results[spec[0]]:
+                    logger.warning("Stopping after the first component test failure. Pass --run-all to run every test.")
+                    break
+        
+        # Run complete pipeline test if all component tests pass
+        if args.only:
+            logger.info("Skipping complete pipeline test because only some component tests were selected")
+            results["Complete Pipeline"] = None
+        elif all(results.values()):
+            results["Complete Pipeline"] = test_complete_pipeline()
+        else:
+            logger.warning("Skipping complete pipeline test due to component test failures")
+            results["Complete Pipeline"] = None
+        
+        # Print summary
+        logger.info("\n--- Test Summary ---")
+        for name, result in results.items():
+            status = "SKIPPED" if result is None else "PASS" if result else "FAIL"
+            logger.info(f"{name}: {status}")
+        
+        if all(results.values()):
+            logger.info("All tests passed successfully!")
+        elif False in results.values():
+            logger.warning("Some tests failed. Check the log for details.")
+        else:
+            logger.info("All tests that ran passed; the rest were skipped.")
+    finally:
+        # Write out whatever is still buffered for the log file
+        log_buffer.flush()
 
 if __name__ == "__main__":
     main()